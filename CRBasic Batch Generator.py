@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+import multiprocessing
+import sys
+from crbasic.batch import main
+
+# CRBasic Batch Generator.py
+# Generates the programs for every site listed in a CSV/JSON manifest without opening the GUI.
+# Example: python "CRBasic Batch Generator.py" sites.csv --workers 8
+
+################################ Driver Code ################################
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
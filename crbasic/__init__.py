@@ -0,0 +1,8 @@
+# crbasic
+# CRBasic program generation shared by the GUI and the batch generator. Nothing in this package
+# imports Tkinter.
+
+from crbasic.config import StationConfig, ConfigError
+from crbasic.catalog import CatalogError, get_catalog
+from crbasic.generator import canonicalize, generate, generate_program, program_filename, save_program
+from crbasic.cache import ProgramCache
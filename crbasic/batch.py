@@ -0,0 +1,376 @@
+# batch.py
+# Headless batch mode. Reads a CSV or JSON manifest with one row per site and generates every site's
+# program across a pool of worker processes, then prints a per-site success/failure summary.
+#
+# Usage: python "CRBasic Batch Generator.py" sites.csv [--workers N] [--path ./Programs/] [--no-cache]
+#                                                      [--profile profile.json] [--scan-times] [--strict-scans]
+#                                                      [--schedule auto] [--sdi12 concurrent] [--serial response]
+#                                                      [--parse once] [--constants fold] [--dead-variables drop]
+#                                                      [--wetbulb newton] [--two-minute running] [--storage]
+#                                                      [--table-size auto] [--bandwidth] [--field-types narrow]
+#                                                      [--status-tables change] [--polled variables.txt]
+#                                                      [--diagnostics 10]
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from crbasic.cache import ProgramCache, cache_key
+from crbasic.config import StationConfig, ConfigError, FLAGS, OPTIONS
+from crbasic.emitter import write_atomic
+from crbasic.generator import FRAGMENTS, generate, program_filename, program_header
+from crbasic.optimize import unknown_polled
+from crbasic.profiling import SectionProfile, format_summary
+from crbasic.scantime import budget_warnings, check_scans, format_estimates
+from crbasic.storage import format_plan, plan_tables, public_bytes, storage_warnings
+from crbasic.telemetry import compare_bandwidth, format_bandwidth
+
+# Manifest column names (lower case) and the station attribute each one fills in
+COLUMNS = {
+    "username": "username", "user": "username",
+    "date": "date",
+    "site_name": "site_name", "site": "site_name",
+    "logger_type": "logger_type", "logger": "logger_type",
+    "wind": "wind", "anemometer": "wind",
+    "temp": "temp", "thermometer": "temp",
+    "rs": "RS", "road_sensor": "RS",
+    "rs_com": "RS_com", "rs_radio": "RS_com",
+    "subprobe": "subprobe",
+    "snow": "Snow",
+    "snow_const": "Snow_const", "snow_constant": "Snow_const",
+    "cs125": "CS125",
+    "te525": "TE525",
+    "pyro": "pyro", "li200x": "pyro",
+    "cs655": "CS655",
+    "cc640": "CC640",
+    "light": "light", "sw12v": "light",
+    "schedule": "schedule",
+    "sdi12": "sdi12",
+    "serial": "serial",
+    "parse": "parse",
+    "constants": "constants",
+    "dead_variables": "dead_variables",
+    "wetbulb": "wetbulb",
+    "two_minute": "two_minute",
+    "status_tables": "status_tables",
+    "field_types": "field_types",
+    "table_size": "table_size",
+    "retention_days": "retention_days", "retention": "retention_days",
+    "polled": "polled",
+    "diagnostics": "diagnostics",
+}
+# Outcome of one manifest row. error is None on success. reused is True if the program was not generated
+# for this row but taken from the cache or from an equivalent site earlier in the run. scans holds the
+# scantime.ScanEstimate of every scan in the program, tables the storage.TablePlan of every data table and
+# bandwidth the program's telemetry.Bandwidth as generated and with narrowed output types. For a station
+# with polled variables, public holds the bytes of a Public table record before and after demoting the
+# others to Dim and unknown the polled names that match no Public variable or alias.
+SiteResult = namedtuple("SiteResult", "site filename error reused scans tables logger_type bandwidth public unknown",
+                        defaults=((), (), None, None, None, ()))
+
+REQUIRED = ("username", "date", "site_name", "logger_type", "wind", "temp", "RS", "subprobe", "Snow")
+
+
+# Raised for a manifest row that can not be turned into a station
+class ManifestError(ConfigError):
+    pass
+
+
+# Reads the manifest file and returns a list of rows (dicts of column name to value)
+def read_manifest(manifest):
+    if manifest.lower().endswith(".json"):
+        with open(manifest) as f:
+            rows = json.load(f)
+        if isinstance(rows, dict):
+            rows = rows["sites"]
+    else:
+        with open(manifest, newline="") as f:
+            rows = list(csv.DictReader(f))
+    return rows
+
+
+# Converts a checkbox style value (1/0, yes/no, true/false, blank) to 1 or 0
+def _flag(value):
+    if isinstance(value, bool) or isinstance(value, int):
+        return int(bool(value))
+    value = str(value).strip().lower()
+    if value in ("1", "y", "yes", "true", "x"):
+        return 1
+    if value in ("", "0", "n", "no", "false"):
+        return 0
+    raise ManifestError("Not a yes/no value: {0}".format(value))
+
+
+# Converts a list of variable names (a list, or one string separated by commas, semicolons or white space)
+# to the sorted tuple a StationConfig takes
+def polled_names(value):
+    names = value if isinstance(value, (list, tuple)) else re.split(r"[\s,;]+", str(value or ""))
+    return tuple(sorted({str(name).strip() for name in names} - {""}, key=str.lower))
+
+
+# Minutes of a diagnostics column or days of a retention_days column (blank for none)
+def _number(value, unit="minutes"):
+    value = "" if value is None else str(value).strip()
+    if value.isdigit():
+        return int(value)
+    raise ManifestError("Not a number of {0}: {1}".format(unit, value))
+
+
+# Builds a StationConfig from one manifest row and validates it like the GUI does. options gives the
+# generator options (see config.OPTIONS) of rows that do not have their column.
+def config_from_row(row, options=None):
+    station = dict.fromkeys(REQUIRED, "")
+    station.update(options or {})
+    for key, value in row.items():
+        if key is None or key.strip().lower() not in COLUMNS:
+            continue
+        attr = COLUMNS[key.strip().lower()]
+        if attr in FLAGS:
+            station[attr] = _flag(value)
+        elif attr == "polled":
+            if polled_names(value):
+                station[attr] = polled_names(value)
+        elif attr in ("diagnostics", "retention_days"):
+            if str(value if value is not None else "").strip():
+                station[attr] = _number(value, "minutes" if attr == "diagnostics" else "days")
+        else:
+            station[attr] = "" if value is None else str(value).strip()
+    if station.get("Snow_const", "") == "":
+        station["Snow_const"] = "0"
+    for field in OPTIONS:
+        if station.get(field, None) == "":
+            del station[field]
+    return StationConfig(**station).validate()
+
+
+# Worker: generates the program of a group of equivalent stations once (through the program cache in
+# cache_folder unless it is None) and writes it for every station in the group with its own header.
+# Returns a SiteResult for each station and a dict with the worker's section fragment cache hits and
+# misses and, if profile is set, the section profile of the generated program (None if it was cached).
+# With refuse_scans set a program whose estimated scan time exceeds a scan interval is not written.
+def _generate_group(configs, path, cache_folder, profile=False, refuse_scans=False):
+    hits, misses = FRAGMENTS.hits, FRAGMENTS.misses
+    sections = SectionProfile() if profile else None
+    results = []
+    try:
+        first = configs[0]
+        cache = ProgramCache(cache_folder) if cache_folder is not None else None
+        text = cache.generate(first, sections) if cache is not None else generate(first, sections)
+        body = text[len(program_header(first)):]
+        scans = tuple(check_scans(body, first.logger_type, refuse_scans))
+        tables = tuple(plan_tables(body, first.logger_type))
+        bandwidth = compare_bandwidth(body, first.logger_type)
+        public = None
+        unknown = ()
+        if first.polled:
+            everything = generate(first.replace(polled=()))
+            public = (public_bytes(everything), public_bytes(body))
+            unknown = tuple(unknown_polled(everything, first.polled))
+        for n, config in enumerate(configs):
+            filename = program_filename(config)
+            write_atomic(os.path.join(path, filename), program_header(config) + body)
+            results.append(SiteResult(config.site_name, filename, None, n > 0 or bool(cache and cache.hits),
+                                      scans, tables, config.logger_type, bandwidth, public, unknown))
+    except Exception as e:
+        error = "{0}: {1}".format(type(e).__name__, e)
+        results.extend(SiteResult(config.site_name, None, error, False) for config in configs[len(results):])
+    stats = {"fragment_hits": FRAGMENTS.hits - hits, "fragment_misses": FRAGMENTS.misses - misses}
+    if sections is not None:
+        stats["profile"] = sections.as_dict() if sections.sections else None
+    return results, stats
+
+
+# Generates every row of the manifest with a pool of worker processes and returns the list of SiteResults
+# in manifest order. Rows are grouped by canonical configuration so each distinct program is only
+# generated once per run. The grouping leaves out the check for optimization steps that change nothing,
+# which costs a generation; with a cache the workers' cache keys make it, sharing the work with
+# generation. Section fragment cache hits and misses of all workers are added to counters (a dict) if
+# given. With profile set, counters also gets "runs", the section profile of every generated program, and
+# "profile", their total. With refuse_scans set, sites whose scans would not fit their intervals fail
+# instead of being written. options are the generator options of rows without their column.
+def generate_batch(rows, path="./Programs/", workers=None, cache_folder=None, counters=None, profile=False,
+                   refuse_scans=False, options=None):
+    os.makedirs(path, exist_ok=True)
+    results = [None] * len(rows)
+    groups = {}
+    for n, row in enumerate(rows):
+        try:
+            config = config_from_row(row, options)
+        except ConfigError as e:
+            results[n] = SiteResult(str(row.get("site_name") or row.get("site") or "?"), None, str(e), False)
+            continue
+        groups.setdefault(cache_key(config, steps=False), []).append((n, config))
+
+    groups = list(groups.values())
+    configs = [[config for n, config in group] for group in groups]
+    if workers == 1 or len(groups) <= 1:
+        group_results = [_generate_group(group, path, cache_folder, profile, refuse_scans) for group in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            group_results = list(pool.map(_generate_group, configs, [path] * len(groups),
+                                          [cache_folder] * len(groups), [profile] * len(groups),
+                                          [refuse_scans] * len(groups), chunksize=max(1, len(groups) // 64)))
+    total = SectionProfile()
+    runs = []
+    for group, (group_result, stats) in zip(groups, group_results):
+        for (n, config), result in zip(group, group_result):
+            results[n] = result
+        if counters is not None:
+            counters["fragment_hits"] = counters.get("fragment_hits", 0) + stats["fragment_hits"]
+            counters["fragment_misses"] = counters.get("fragment_misses", 0) + stats["fragment_misses"]
+        if stats.get("profile"):
+            config = group[0][1]
+            runs.append({"site": config.site_name, "logger_type": config.logger_type,
+                         "sites": len(group), "sections": stats["profile"]})
+            total.merge(stats["profile"])
+    if counters is not None and profile:
+        counters["runs"] = runs
+        counters["profile"] = total.as_dict()
+    return results
+
+
+# Prints the per-site summary (and the fragment cache counters of generate_batch) and returns the number
+# of failures. Scans estimated to overrun their interval and data tables that do not fit final storage are
+# always listed; scan_times prints the full estimate, storage the table plan and bandwidth the bytes sent
+# per poll and per day of every site, and the fleet's total.
+def print_summary(results, out=sys.stdout, counters=None, scan_times=False, storage=False, bandwidth=False):
+    failures = 0
+    reused = 0
+    fleet = [0.0, 0.0]
+    for result in results:
+        if result.error is None:
+            reused += result.reused
+            out.write("OK    {0:<24} {1}{2}\n".format(result.site, result.filename, " (reused)" * result.reused))
+            for warning in budget_warnings(result.scans):
+                out.write("WARN  {0:<24} {1}\n".format(result.site, warning))
+            for warning in storage_warnings(result.tables, result.logger_type):
+                out.write("WARN  {0:<24} {1}\n".format(result.site, warning))
+            if result.unknown:
+                out.write("WARN  {0:<24} polled names that are not a Public variable or alias: {1}\n".format(
+                    result.site, ", ".join(result.unknown)))
+            if scan_times and result.scans:
+                out.write("".join("      " + row + "\n" for row in format_estimates(result.scans).splitlines()))
+            if storage and result.tables:
+                out.write("".join("      " + row + "\n"
+                                  for row in format_plan(result.tables, result.logger_type).splitlines()))
+            if result.public:
+                out.write("      Public table: {0[1]} B per record, {0[0]} B before demoting the variables that "
+                          "are not polled\n".format(result.public))
+            if bandwidth and result.bandwidth:
+                out.write("      Telemetry: {0}\n".format(format_bandwidth(*result.bandwidth)))
+                fleet[0] += result.bandwidth[0].per_day
+                fleet[1] += result.bandwidth[1].per_day
+        else:
+            failures += 1
+            out.write("FAIL  {0:<24} {1}\n".format(result.site, result.error))
+    out.write("\n{0} generated ({1} reused), {2} failed\n".format(len(results) - failures, reused, failures))
+    if bandwidth:
+        out.write("Telemetry: {0:.1f} MB per day for the fleet, {1:.1f} MB per day with narrowed output types "
+                  "({2:.1f}% less)\n".format(fleet[0] / 2 ** 20, fleet[1] / 2 ** 20,
+                                             100 * (fleet[0] - fleet[1]) / fleet[0] if fleet[0] else 0.0))
+    if counters:
+        out.write("Section fragments: {0} reused, {1} rendered\n".format(counters.get("fragment_hits", 0),
+                                                                      counters.get("fragment_misses", 0)))
+    if counters and "profile" in counters:
+        if counters["runs"]:
+            out.write("\nSection profile of {0} generated programs:\n".format(len(counters["runs"])))
+            out.write(format_summary(SectionProfile().merge(counters["profile"])))
+        else:
+            out.write("\nNo programs were generated to profile (all came from the cache, see --no-cache)\n")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate CRBasic programs for every site in a manifest.")
+    parser.add_argument("manifest", help="CSV or JSON file with one row per site")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--path", default="./Programs/", help="output folder (default: ./Programs/)")
+    parser.add_argument("--cache", default=None, help="program cache folder (default: <path>/.cache)")
+    parser.add_argument("--no-cache", action="store_true", help="always generate programs from scratch")
+    parser.add_argument("--profile", default=None,
+                        help="save per-program and total section timings, lines and bytes to this JSON file")
+    parser.add_argument("--scan-times", action="store_true",
+                        help="print the estimated measure and process time of every scan of every program")
+    parser.add_argument("--strict-scans", action="store_true",
+                        help="do not write programs whose estimated scan time exceeds the scan interval")
+    parser.add_argument("--storage", action="store_true",
+                        help="print the record size, final storage and days of data of every data table")
+    parser.add_argument("--bandwidth", action="store_true",
+                        help="print the bytes every site sends per poll and per day, as generated and with "
+                             "narrowed output types, and the fleet's total")
+    parser.add_argument("--schedule", choices=OPTIONS["schedule"], default=OPTIONS["schedule"][0],
+                        help="'auto' lets the scan scheduler split slow work into slow sequences (default: "
+                             "fixed); a schedule column in the manifest overrides it")
+    parser.add_argument("--sdi12", choices=OPTIONS["sdi12"], default=OPTIONS["sdi12"][0],
+                        help="'concurrent' starts SDI-12 measurements with C! so they overlap (CR1000X, default: "
+                             "sequential); an sdi12 column in the manifest overrides it")
+    parser.add_argument("--serial", choices=OPTIONS["serial"], default=OPTIONS["serial"][0],
+                        help="'response' reads the CS125, DSC/DST and IceSight as soon as they answer instead of "
+                             "after a fixed Delay (default: delay); a serial column in the manifest overrides it")
+    parser.add_argument("--parse", choices=OPTIONS["parse"], default=OPTIONS["parse"][0],
+                        help="'once' splits the DSC/DST message once instead of searching it for every field "
+                             "(default: per-field); a parse column in the manifest overrides it")
+    parser.add_argument("--constants", choices=OPTIONS["constants"], default=OPTIONS["constants"][0],
+                        help="'fold' drops the If blocks on instrument Consts (solar_exist, TE525_exist) whose "
+                             "outcome is known when generating (default: keep); a constants column overrides it")
+    parser.add_argument("--dead-variables", choices=OPTIONS["dead_variables"], default=OPTIONS["dead_variables"][0],
+                        help="'drop' removes declarations, aliases, units and table fields nothing reads or writes "
+                             "(default: keep); a dead_variables column in the manifest overrides it")
+    parser.add_argument("--wetbulb", choices=OPTIONS["wetbulb"], default=OPTIONS["wetbulb"][0],
+                        help="how the wet-bulb temperature is found: 'stull' closed form, 'newton' iteration or "
+                             "the bisection once per 'output' interval (default: bisection); a wetbulb column "
+                             "overrides it")
+    parser.add_argument("--two-minute", choices=OPTIONS["two_minute"], default=OPTIONS["two_minute"][0],
+                        help="'running' computes the two minute wind vector average in the main scan instead of "
+                             "reading it back from the TwoMinute table (default: table); a two_minute column "
+                             "overrides it")
+    parser.add_argument("--table-size", choices=OPTIONS["table_size"], default=OPTIONS["table_size"][0],
+                        help="'auto' sizes the data tables for --retention-days of data within the logger's "
+                             "final storage (default: fixed); a table_size column overrides it")
+    parser.add_argument("--retention-days", type=int, default=StationConfig.retention_days, metavar="DAYS",
+                        help="days of data --table-size auto and the Diagnostics table size the tables for "
+                             "(default: 30); a retention_days column overrides it")
+    parser.add_argument("--status-tables", choices=OPTIONS["status_tables"], default=OPTIONS["status_tables"][0],
+                        help="'change' moves String, alarm and state code fields out of the 10 minute tables into "
+                             "tables that only record a change (default: interval); a status_tables column "
+                             "overrides it")
+    parser.add_argument("--field-types", choices=OPTIONS["field_types"], default=OPTIONS["field_types"][0],
+                        help="'narrow' writes table fields in the smallest data type their range and resolution "
+                             "allow (default: keep); a field_types column overrides it")
+    parser.add_argument("--polled", default=None,
+                        help="file with the names of the variables the collection system reads (separated by "
+                             "lines, commas or spaces); every other Public variable is declared with Dim. A "
+                             "polled column in the manifest overrides it")
+    parser.add_argument("--diagnostics", type=int, default=0, metavar="MINUTES",
+                        help="adds a Diagnostics table that records the scans' process times, skipped scans and "
+                             "buffer depth from the Status table every MINUTES (default: 0, no table); a "
+                             "diagnostics column overrides it")
+    args = parser.parse_args(argv)
+
+    path = os.path.join(args.path, "")
+    cache_folder = None if args.no_cache else (args.cache or os.path.join(path, ".cache"))
+    counters = {}
+    options = {field: getattr(args, field) for field in OPTIONS}
+    if args.polled:
+        with open(args.polled) as f:
+            options["polled"] = polled_names(f.read())
+    options["diagnostics"] = args.diagnostics
+    options["retention_days"] = args.retention_days
+    results = generate_batch(read_manifest(args.manifest), path, args.workers, cache_folder, counters,
+                             profile=args.profile is not None, refuse_scans=args.strict_scans,
+                             options=options)
+    failures = print_summary(results, counters=counters, scan_times=args.scan_times, storage=args.storage,
+                             bandwidth=args.bandwidth)
+    if args.profile:
+        with open(args.profile, "w") as f:
+            json.dump({"runs": counters["runs"], "batch": counters["profile"]}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
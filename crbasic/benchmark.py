@@ -0,0 +1,192 @@
+# benchmark.py
+# Generation benchmark over the GUI's configuration space. Sweeps every combination of form inputs (or a
+# stratified sample of them) through generate() and reports programs per second, per-program latency
+# percentiles, peak RSS and the bytes written per logger type. Running the sweep with several worker
+# counts shows how the batch pipeline scales with cores. --json saves the report so releases can be
+# compared.
+#
+# Usage: python -m crbasic.benchmark [--sample N] [--workers 1,2,4] [--write] [--json report.json]
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from crbasic.config import StationConfig, CHOICES, FLAGS
+from crbasic.fragments import FragmentCache
+from crbasic.generator import FRAGMENTS, GENERATOR_VERSION, generate, generate_program
+
+try:
+    import resource
+except ImportError:     # Windows
+    resource = None
+
+# Drop down fields in the order the form shows them; a stratum is one combination of their values
+DROPDOWNS = ("logger_type", "wind", "temp", "RS", "subprobe", "Snow")
+
+
+# Builds the StationConfig of one point in the space
+def _station(n, values):
+    return StationConfig(username="bench", date="010124", site_name="Bench{0}".format(n), Snow_const="42",
+                         **values)
+
+
+# Yields a StationConfig for every combination of form inputs
+def config_space():
+    fields = DROPDOWNS + FLAGS
+    choices = [CHOICES[field] for field in DROPDOWNS] + [(0, 1)] * len(FLAGS)
+    for n, values in enumerate(itertools.product(*choices)):
+        yield _station(n, dict(zip(fields, values)))
+
+
+# Returns about size configs: the same number of random checkbox combinations for every combination of
+# drop down values, so each logger, sensor and sensor pairing is represented even in a small sample
+def stratified_sample(size, seed=0):
+    rng = random.Random(seed)
+    strata = list(itertools.product(*(CHOICES[field] for field in DROPDOWNS)))
+    flag_sets = list(itertools.product((0, 1), repeat=len(FLAGS)))
+    per_stratum = min(len(flag_sets), max(1, math.ceil(size / len(strata))))
+    configs = []
+    for stratum in strata:
+        for flags in rng.sample(flag_sets, per_stratum):
+            values = dict(zip(DROPDOWNS, stratum))
+            values.update(zip(FLAGS, flags))
+            configs.append(_station(len(configs), values))
+    return configs
+
+
+# Nearest-rank percentile of a sorted list
+def percentile(values, q):
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(q / 100 * len(values)) - 1))]
+
+
+# Peak resident set size in bytes of this process and its finished children, or None if unknown
+def peak_rss():
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Starts every sweep, inline and in each worker process, with an empty section fragment cache (of the
+# default size, or none at all without fragments) so no sweep runs on fragments an earlier one rendered
+def _reset_fragments(fragments=True):
+    FRAGMENTS.clear()
+    FRAGMENTS.maxsize = FragmentCache().maxsize if fragments else 0
+
+
+# Worker: generates every config (saving it in folder unless folder is None) and returns the latency of
+# each program in seconds and the bytes produced per logger type
+def _run_chunk(configs, folder):
+    latencies = []
+    sizes = {}
+    for config in configs:
+        start = time.perf_counter()
+        if folder is None:
+            size = len(generate(config).encode("utf-8"))
+        else:
+            size = os.path.getsize(os.path.join(folder, generate_program(config, folder)))
+        latencies.append(time.perf_counter() - start)
+        total, count = sizes.get(config.logger_type, (0, 0))
+        sizes[config.logger_type] = (total + size, count + 1)
+    return latencies, sizes
+
+
+# Runs one sweep of configs over the given number of worker processes (1 runs inline), with or without
+# the section fragment cache, and returns its report
+def run_sweep(configs, workers=1, write=False, fragments=True):
+    folder = tempfile.mkdtemp(prefix="crbasic-bench-") if write else None
+    try:
+        chunks = [configs[n::workers * 8] for n in range(min(len(configs), workers * 8))]
+        _reset_fragments(fragments)
+        start = time.perf_counter()
+        if workers == 1:
+            results = [_run_chunk(chunk, folder) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_reset_fragments,
+                                     initargs=(fragments,)) as pool:
+                results = list(pool.map(_run_chunk, chunks, [folder] * len(chunks)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if folder is not None:
+            shutil.rmtree(folder, ignore_errors=True)
+    latencies = sorted(latency for chunk_latencies, _ in results for latency in chunk_latencies)
+    sizes = {}
+    for _, chunk_sizes in results:
+        for logger, (total, count) in chunk_sizes.items():
+            old_total, old_count = sizes.get(logger, (0, 0))
+            sizes[logger] = (old_total + total, old_count + count)
+    return {
+        "workers": workers,
+        "programs": len(latencies),
+        "seconds": elapsed,
+        "programs_per_sec": len(latencies) / elapsed if elapsed else None,
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "latency_max_ms": latencies[-1] * 1000,
+        "bytes_per_logger": {logger: {"programs": count, "total": total, "mean": total / count}
+                             for logger, (total, count) in sorted(sizes.items())},
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+# Prints the human readable report
+def print_report(report, out=sys.stdout):
+    out.write("Generator {0}, {1} configs ({2}), Python {3}, {4} CPUs\n".format(
+        report["generator_version"], report["configs"], report["space"], report["python"], report["cpus"]))
+    base = report["sweeps"][0]["programs_per_sec"]
+    for sweep in report["sweeps"]:
+        out.write("\n{0} worker(s): {1:.0f} programs/sec ({2:.2f}x), p50 {3:.3f} ms, p99 {4:.3f} ms, "
+                  "max {5:.3f} ms\n".format(sweep["workers"], sweep["programs_per_sec"],
+                                            sweep["programs_per_sec"] / base, sweep["latency_p50_ms"],
+                                            sweep["latency_p99_ms"], sweep["latency_max_ms"]))
+        for logger, size in sweep["bytes_per_logger"].items():
+            out.write("  {0:<8} {1:>7} programs {2:>13,} bytes ({3:,.0f} per program)\n".format(
+                logger, size["programs"], size["total"], size["mean"]))
+    rss = report["sweeps"][-1]["peak_rss_bytes"]
+    out.write("\nPeak RSS: {0}\n".format("n/a" if rss is None else "{0:.1f} MB".format(rss / 2 ** 20)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark program generation across the config space.")
+    parser.add_argument("--sample", type=int, default=None,
+                        help="stratified sample of about N configs (default: the full space)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the sample")
+    parser.add_argument("--workers", default="1", help="comma separated worker counts to sweep with")
+    parser.add_argument("--write", action="store_true", help="also save every program to a temporary folder")
+    parser.add_argument("--no-fragments", action="store_true", help="disable the section fragment cache")
+    parser.add_argument("--json", default=None, help="save the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    configs = list(config_space()) if args.sample is None else stratified_sample(args.sample, args.seed)
+    report = {
+        "generator_version": GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "space": "full" if args.sample is None else "stratified sample, seed {0}".format(args.seed),
+        "configs": len(configs),
+        "fragments": not args.no_fragments,
+        "sweeps": [run_sweep(configs, int(workers), args.write, not args.no_fragments)
+                   for workers in args.workers.split(",")],
+    }
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
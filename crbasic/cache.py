@@ -0,0 +1,93 @@
+# cache.py
+# Persistent, content addressed cache of generated programs. Only the first two lines of a program depend
+# on the site name, date and user (see generator.program_header), so everything after them is stored
+# once per distinct station configuration. The key is a hash of the configuration without those three
+# fields plus the generator version, so a cache hit only has to re-stamp the header.
+
+import hashlib
+import json
+import marshal
+import os
+
+from crbasic import catalog, diagnostics, generator, optimize, program, scantime, scheduler, storage, telemetry
+from crbasic import config as station_config
+from crbasic.emitter import write_atomic
+from crbasic.generator import GENERATOR_VERSION, canonicalize, generate, program_header, save_program
+
+# Fields that only appear in the program header and file name
+HEADER_FIELDS = ("username", "date", "site_name")
+
+_fingerprint = None
+
+
+# Modules whose code or constants shape the text of a generated program. The batch runner, benchmark,
+# profiler and TOA5 reader are left out, so editing them keeps the cache.
+GENERATING_MODULES = (generator, catalog, station_config, optimize, scheduler, scantime, storage, telemetry,
+                      diagnostics, program)
+
+
+# Returns the generator version used in cache keys. GENERATOR_VERSION is combined with a hash of the
+# source of every module in GENERATING_MODULES and of the catalog contents, so that editing the generator's
+# code or constants, or the sensor catalog, invalidates the cache even if nobody remembers to bump the version.
+# In an executable built without the sources, the compiled code of the same modules is hashed instead
+# (their constants are then covered by GENERATOR_VERSION only).
+def generator_version():
+    global _fingerprint
+    if _fingerprint is None:
+        code = hashlib.sha256()
+        for module in GENERATING_MODULES:
+            source = os.path.splitext(getattr(module, "__file__", None) or "")[0] + ".py"
+            code.update(module.__name__.encode("utf-8") + b"\0")
+            if os.path.isfile(source):
+                with open(source, "rb") as f:
+                    code.update(f.read())
+            else:
+                for function in catalog.module_code(module):
+                    code.update(marshal.dumps(function))
+        code.update(catalog.get_catalog().digest.encode("ascii"))
+        _fingerprint = "{0}-{1}".format(GENERATOR_VERSION, code.hexdigest()[:16])
+    return _fingerprint
+
+
+# Returns the cache key of a station: the hash of its canonical configuration (see
+# generator.canonicalize), minus the header fields, and the generator version. Stations that generate
+# the same program share a key. With steps=False the generator options are not checked for steps that
+# leave the program unchanged, so the key is cheap but equivalent stations may get different keys.
+def cache_key(config, steps=True):
+    fields = canonicalize(config, steps).as_dict()
+    for field in HEADER_FIELDS:
+        del fields[field]
+    canonical = json.dumps({"version": generator_version(), "config": fields}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ProgramCache:
+    def __init__(self, folder):
+        self.folder = folder
+        self.hits = 0
+        self.misses = 0
+
+    # Path of the stored program body for a key
+    def body_path(self, key):
+        return os.path.join(self.folder, key[:2], key + ".body")
+
+    # Returns the program text for a station, from the cache if an equivalent station was generated before.
+    # profile is passed on to generator.generate() when the program has to be generated.
+    def generate(self, config, profile=None):
+        header = program_header(config)
+        path = self.body_path(cache_key(config))
+        try:
+            with open(path) as f:
+                body = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            text = generate(config, profile)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_atomic(path, text[len(header):])
+            return text
+        self.hits += 1
+        return header + body
+
+    # Same as generator.generate_program() but goes through the cache
+    def generate_program(self, config, path):
+        return save_program(config, path, self.generate(config))
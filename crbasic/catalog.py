@@ -0,0 +1,605 @@
+# catalog.py
+# Loads the sensor catalog (catalog.json) that describes every instrument the generator knows about and
+# compiles it into a program template per logger. Each instrument record says when it applies (the
+# StationConfig values that select it) and which CRBasic lines it contributes to each section of the
+# program: header name, constants, public/private declarations, units, data table fields, subroutines,
+# the 1 second main scan and the slow sequences. Adding an instrument or supporting a new logger is an
+# edit to catalog.json, not to the generator.
+#
+# A "when" is a mapping of StationConfig field to an allowed value or list of values; every field must
+# match. A section's lines may be given as a list (using the record's "when") or as
+# {"when": ..., "lines": [...]} to override it ({} means always). "fallback" lines only fill a slow
+# sequence that other instruments already use. A main scan section with a "rate" (seconds) is slow work
+# the scan scheduler may move into a slow sequence of that rate (see scheduler.py). Lines are strings
+# ({field} is replaced with the station's value), {"when": ..., "lines": [...]} groups, or
+# {"include": "<block>"} to insert a shared block.
+#
+# Parsing and validating the JSON is skipped on later runs: the compiled catalog is pickled into a binary
+# cache file (catalog.cache, next to the executable when frozen by PyInstaller) that is memory mapped and
+# reused as long as it was built from the same catalog.json by the same catalog code.
+
+import hashlib
+import json
+import marshal
+import mmap
+import os
+import pickle
+import string
+import sys
+import types
+
+from crbasic import scheduler
+from crbasic.config import CHOICES, FLAGS, OPTIONS
+from crbasic.emitter import write_atomic
+from crbasic.program import Program, parse_statement, scan_interval
+from crbasic.scantime import estimate_statements
+from crbasic.storage import string_sizes
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+if getattr(sys, "frozen", False):
+    CACHE_PATH = os.path.join(os.path.dirname(sys.executable), "catalog.cache")
+else:
+    CACHE_PATH = os.path.join(os.path.dirname(CATALOG_PATH), "catalog.cache")
+CACHE_MAGIC = b"CRBasic catalog cache\n"
+
+# Sections a record can contribute lines to (tables and sequences take a mapping of name to lines)
+LINE_SLOTS = ("constants", "public", "private", "units", "subroutines", "main", "calltables")
+MAPPED_SLOTS = ("tables", "sequences")
+LAYOUT_PARTS = ("instruments", "table_list", "lines", "tables", "sequences", "text")
+# StationConfig fields the catalog can test and substitute
+FIELDS = tuple(CHOICES) + FLAGS + ("Snow_const",) + tuple(OPTIONS)
+
+_catalog = None
+_fingerprint = None
+
+
+class CatalogError(ValueError):
+    pass
+
+
+# Returns the catalog shipped with the generator, loading it on first use
+def get_catalog():
+    global _catalog
+    if _catalog is None:
+        _catalog = load_cached_catalog()
+    return _catalog
+
+
+# Reads, validates and compiles the catalog file at path (source may hold its contents already)
+def load_catalog(path=CATALOG_PATH, source=None):
+    if source is None:
+        with open(path, "rb") as f:
+            source = f.read()
+    try:
+        data = json.loads(source.decode("utf-8"))
+    except ValueError as e:
+        raise CatalogError("{0}: {1}".format(path, e))
+    return Catalog(data)
+
+
+# Yields the code of every function and method defined in module, in definition order
+def module_code(module):
+    for value in vars(module).values():
+        if getattr(value, "__module__", None) != module.__name__:
+            continue
+        if isinstance(value, types.FunctionType):
+            yield value.__code__
+        elif isinstance(value, type):
+            for method in vars(value).values():
+                if isinstance(method, types.FunctionType):
+                    yield method.__code__
+
+
+# Modules the compiled catalog depends on: the compiler itself, the station option tables it expands
+# conditions against, and the parsing, scheduling, scan time and storage code behind each logger's schedule
+COMPILER_MODULES = ("crbasic.catalog", "crbasic.config", "crbasic.program", "crbasic.scheduler", "crbasic.scantime",
+                    "crbasic.storage")
+
+
+# Hash of the code and upper case constants (CHOICES, OPTIONS, the scan time prices, ...) of
+# COMPILER_MODULES and of the Python version, so a cache written by other compiler code is ignored. File
+# paths are left out, since the one-file exe unpacks to a new folder on every launch.
+def _compiler_fingerprint():
+    global _fingerprint
+    if _fingerprint is None:
+        code = hashlib.sha256(sys.version.encode("utf-8"))
+        for name in COMPILER_MODULES:
+            module = sys.modules[name]
+            for function in module_code(module):
+                code.update(marshal.dumps(function))
+            for key, value in sorted(vars(module).items()):
+                if key.lstrip("_").isupper() and not key.endswith("_PATH"):
+                    code.update("{0}={1!r}\n".format(key, value).encode("utf-8"))
+        _fingerprint = code.hexdigest()
+    return _fingerprint
+
+
+# Returns the compiled catalog at path, taken from the binary cache at cache_path when that was built
+# from the same source. The cache header records the source's mtime, size and sha256: when mtime and size
+# match the cache is used without reading the source, otherwise the source is hashed and the cache is
+# still used if only the mtime changed (the one-file exe unpacks catalog.json again on every launch).
+# Anything else compiles the catalog and rewrites the cache. A missing, damaged or unwritable cache only
+# costs the compile.
+def load_cached_catalog(path=CATALOG_PATH, cache_path=CACHE_PATH):
+    stat = os.stat(path)
+    source = None
+    try:
+        with open(cache_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = data.find(b"\n", len(CACHE_MAGIC))
+            if data[:len(CACHE_MAGIC)] == CACHE_MAGIC and end > 0:
+                header = json.loads(data[len(CACHE_MAGIC):end].decode("utf-8"))
+                if header["compiler"] == _compiler_fingerprint() and header["size"] == stat.st_size:
+                    fresh = header["mtime"] == stat.st_mtime_ns
+                    if not fresh:
+                        with open(path, "rb") as source_file:
+                            source = source_file.read()
+                        fresh = hashlib.sha256(source).hexdigest() == header["sha256"]
+                    if fresh:
+                        with memoryview(data)[end + 1:] as payload:
+                            return pickle.loads(payload)
+    except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        pass
+    if source is None:
+        with open(path, "rb") as f:
+            source = f.read()
+    catalog = load_catalog(path, source)
+    header = {"compiler": _compiler_fingerprint(), "mtime": stat.st_mtime_ns, "size": stat.st_size,
+              "sha256": hashlib.sha256(source).hexdigest()}
+    try:
+        write_atomic(cache_path, CACHE_MAGIC + json.dumps(header).encode("utf-8") + b"\n"
+                     + pickle.dumps(catalog, pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
+    return catalog
+
+
+# Compiles a "when" mapping into a tuple of (field, allowed values) pairs
+def _compile_when(when, where):
+    if not isinstance(when, dict):
+        raise CatalogError("{0}: when must be a mapping".format(where))
+    compiled = []
+    for field, allowed in when.items():
+        allowed = tuple(allowed) if isinstance(allowed, list) else (allowed,)
+        for value in allowed:
+            _check_value(field, value, where)
+        compiled.append((field, frozenset(allowed)))
+    return tuple(compiled)
+
+
+# Raises CatalogError unless value is one the StationConfig field accepts
+def _check_value(field, value, where):
+    if field not in FIELDS:
+        raise CatalogError("{0}: unknown field {1}".format(where, field))
+    choices = CHOICES.get(field) or OPTIONS.get(field) or ((0, 1) if field in FLAGS else None)
+    if choices is not None and value not in choices:
+        raise CatalogError("{0}: unknown {1}: {2}".format(where, field, value))
+
+
+def _matches(when, values):
+    for field, allowed in when:
+        if values[field] not in allowed:
+            return False
+    return True
+
+
+# Returns the fields a line template substitutes, checking that they are StationConfig fields
+def _template_fields(line, where):
+    fields = []
+    for _, name, spec, conversion in string.Formatter().parse(line):
+        if name is None:
+            continue
+        if name not in FIELDS or spec or conversion:
+            raise CatalogError("{0}: bad substitution {{{1}}} in {2!r}".format(where, name, line))
+        fields.append(name)
+    return tuple(fields)
+
+
+# A compiled run of lines. Items are pre-joined text, ("t", template, fields) substitutions and
+# ("c", when, Lines) conditional groups.
+class Lines:
+    def __init__(self, lines, blocks, where, seen=()):
+        if not isinstance(lines, list):
+            raise CatalogError("{0}: lines must be a list".format(where))
+        self.items = []
+        text = []
+        for line in lines:
+            if isinstance(line, str):
+                fields = _template_fields(line, where)
+                if not fields:
+                    text.append("\n" + line)
+                    continue
+                item = ("t", "\n" + line, fields)
+            elif isinstance(line, dict) and "include" in line:
+                name = line["include"]
+                if name not in blocks:
+                    raise CatalogError("{0}: unknown block {1}".format(where, name))
+                if name in seen:
+                    raise CatalogError("{0}: block {1} includes itself".format(where, name))
+                block = Lines(blocks[name], blocks, "block " + name, seen + (name,))
+                if block.items and isinstance(block.items[0], str) and text:
+                    text.append(block.items.pop(0))
+                if not block.items:
+                    continue
+                if text:
+                    self.items.append("".join(text))
+                    text = []
+                self.items.extend(block.items[:-1])
+                last = block.items[-1]
+                if isinstance(last, str):
+                    text.append(last)
+                else:
+                    self.items.append(last)
+                continue
+            elif isinstance(line, dict) and "lines" in line:
+                item = ("c", _compile_when(line.get("when", {}), where), Lines(line["lines"], blocks, where, seen))
+            else:
+                raise CatalogError("{0}: bad line {1!r}".format(where, line))
+            if text:
+                self.items.append("".join(text))
+                text = []
+            self.items.append(item)
+        if text:
+            self.items.append("".join(text))
+
+    # Adds the fields the lines test or substitute to the set fields
+    def fields(self, fields):
+        for item in self.items:
+            if isinstance(item, str):
+                continue
+            if item[0] == "t":
+                fields.update(item[2])
+            else:
+                fields.update(field for field, _ in item[1])
+                item[2].fields(fields)
+
+    # Appends the text of the lines to out. With trace set, appends the outcome of every condition and
+    # the values of every substitution instead, which is all the text depends on.
+    def render(self, values, out, trace=False):
+        for item in self.items:
+            if isinstance(item, str):
+                if not trace:
+                    out.append(item)
+            elif item[0] == "t":
+                if trace:
+                    out.extend(values[field] for field in item[2])
+                else:
+                    out.append(item[1].format_map(values))
+            else:
+                active = _matches(item[1], values)
+                if trace:
+                    out.append(active)
+                if active:
+                    item[2].render(values, out, trace)
+
+
+# One section of one instrument record for one logger
+class Slot:
+    def __init__(self, spec, when, blocks, where):
+        self.fallback = False
+        self.rate = None
+        if isinstance(spec, dict):
+            if "when" in spec:
+                when = _compile_when(spec["when"], where)
+            self.fallback = bool(spec.get("fallback", False))
+            if "rate" in spec:
+                if not isinstance(spec["rate"], (int, float)) or spec["rate"] <= 0:
+                    raise CatalogError("{0}: rate must be a number of seconds".format(where))
+                self.rate = float(spec["rate"])
+            spec = spec.get("lines")
+        self.when = when
+        self.lines = Lines(spec, blocks, where)
+
+
+# An instrument record compiled for one logger
+class Entry:
+    def __init__(self, record, spec, blocks, tables, sequences, where):
+        self.name = record["name"]
+        self.when = _compile_when(spec.get("when", record.get("when", {})), where)
+        header = spec.get("header")
+        self.header = None
+        if header is not None:
+            self.header = header
+            self.header_fields = _template_fields(header, where)
+        self.slots = {}
+        for slot in LINE_SLOTS:
+            if slot in spec:
+                self.slots[slot] = Slot(spec[slot], self.when, blocks, "{0} {1}".format(where, slot))
+                if self.slots[slot].rate is not None and slot != "main":
+                    raise CatalogError("{0} {1}: only main scan sections have a rate".format(where, slot))
+        for slot, names in ((("tables", tables), ("sequences", sequences))):
+            for name, lines in spec.get(slot, {}).items():
+                if name not in names:
+                    raise CatalogError("{0}: unknown {1} {2}".format(where, slot[:-1], name))
+                self.slots[(slot, name)] = Slot(lines, self.when, blocks, "{0} {1} {2}".format(where, slot, name))
+                if self.slots[(slot, name)].rate is not None:
+                    raise CatalogError("{0} {1} {2}: only main scan sections have a rate".format(where, slot, name))
+        unknown = set(spec) - set(LINE_SLOTS) - set(MAPPED_SLOTS) - {"when", "header"}
+        if unknown:
+            raise CatalogError("{0}: unknown section {1}".format(where, ", ".join(sorted(unknown))))
+
+
+# Name of a section in profiles: the layout part's "name", else one derived from what it renders
+def _section_name(part, sequences):
+    kind = part["part"]
+    if sequences is not None:
+        return "SlowSequence " + sequences[0]["name"]
+    if "name" in part:
+        return part["name"]
+    if kind == "lines":
+        return "/".join(part["slots"])
+    return {"instruments": "instrument list", "table_list": "table list", "tables": "data tables",
+            "text": "end"}.get(kind, kind)
+
+
+# The program template of one logger type: its layout, output tables, slow sequences and the catalog
+# entries that apply to it
+class LoggerTemplate:
+    def __init__(self, logger, spec, instruments, blocks):
+        self.logger = logger
+        self.fixed = dict(spec.get("fixed", {}))
+        for field, value in self.fixed.items():
+            _check_value(field, value, logger)
+        self.tables = spec.get("tables", [])
+        self.sequences = spec.get("sequences", [])
+        self.layout = spec["layout"]
+        for part in self.layout:
+            if part.get("part") not in LAYOUT_PARTS:
+                raise CatalogError("{0}: unknown layout part {1}".format(logger, part.get("part")))
+        table_names = {table["name"] for table in self.tables}
+        sequence_names = {sequence["name"] for sequence in self.sequences}
+        self.entries = [Entry(record, record[logger], blocks, table_names, sequence_names,
+                              "{0} {1}".format(record["name"], logger))
+                        for record in instruments if logger in record]
+        # Instrument list: the entries with a header, in the logger's "header_order" of record names
+        self.header_entries = [entry for entry in self.entries if entry.header is not None]
+        if "header_order" in spec:
+            order = spec["header_order"]
+            named = {entry.name for entry in self.header_entries}
+            if set(order) != named or len(order) != len(named):
+                raise CatalogError("{0}: header_order must name each record with a header once".format(logger))
+            self.header_entries.sort(key=lambda entry: order.index(entry.name))
+        # Memoizable sections: each layout part, except that slow sequences are memoized one by one
+        self.sections = []
+        for part in self.layout:
+            if part["part"] == "sequences":
+                self.sections.extend((part, [sequence], self._part_fields(part, [sequence]))
+                                     for sequence in self.sequences)
+            else:
+                self.sections.append((part, None, self._part_fields(part)))
+        self.section_names = [_section_name(part, sequences) for part, sequences, _ in self.sections]
+        # Scan scheduler: the interval of every slow sequence, whether any main scan section can be moved,
+        # and the fields the scheduled sequences depend on
+        self.intervals = {sequence["name"]: scan_interval(parse_statement(0, sequence["scan"]))
+                          for sequence in self.sequences}
+        self.movable = any(entry.slots["main"].rate is not None for entry in self.entries if "main" in entry.slots)
+        self.schedule_fields = ()
+        if self.sequences or self.movable:
+            fields = set(self._part_fields({"part": "lines", "slots": ["main", "subroutines"]}))
+            fields.update(self._part_fields({"part": "sequences"}))
+            self.schedule_fields = tuple(sorted(fields | {"schedule"}))
+
+    # Applies the values this logger does not let the station choose
+    def fix(self, values):
+        values.update(self.fixed)
+        return values
+
+    # Appends the lines every active entry contributes to slot (leaving out the sections the scan
+    # scheduler moves)
+    def _slot(self, slot, values, out, trace):
+        for entry in self.entries:
+            section = entry.slots.get(slot)
+            if section is None or section.rate is not None and not trace and values["schedule"] == "auto":
+                continue
+            active = _matches(section.when, values)
+            if trace:
+                out.append(active)
+            if active:
+                section.lines.render(values, out, trace)
+
+    # Returns whether any non-fallback section of an active entry fills slot
+    def _used(self, slot, values):
+        for entry in self.entries:
+            section = entry.slots.get(slot)
+            if section is not None and not section.fallback and _matches(section.when, values):
+                return True
+        return False
+
+    # Renders the program body (everything after the two header lines) for the station values. With a
+    # FragmentCache each section (layout part, or single slow sequence) is looked up by the values of the
+    # fields it depends on and only rendered when that combination has not been seen before. With a
+    # SectionProfile the time, lines and bytes of every section are recorded. Scheduled slow sequences are
+    # one section.
+    def render(self, values, trace=False, fragments=None, profile=None):
+        out = []
+        if trace or fragments is None and profile is None:
+            for part in self.layout:
+                self._render_part(part, values, out, trace)
+            return out
+        auto = values["schedule"] == "auto" and self.schedule_fields
+        for n, (part, sequences, fields) in enumerate(self.sections):
+            name = self.section_names[n]
+            if auto and sequences is not None:
+                if sequences[0] is not self.sequences[0]:
+                    continue
+                n, sequences, fields, name = "schedule", None, self.schedule_fields, "scheduled sequences"
+            render = lambda: "".join(self._render_part(part, values, [], False, sequences))
+            if fragments is not None:
+                key = (self, n) + tuple(values[field] for field in fields)
+                render = lambda render=render, key=key: fragments.get(key, render)
+            out.append(render() if profile is None else profile.measure(name, render))
+        return out
+
+    # Appends one layout part to out (a sequences part only renders the given sequences)
+    def _render_part(self, part, values, out, trace, sequences=None):
+        kind = part["part"]
+        if kind == "instruments":
+            names = []
+            for entry in self.header_entries:
+                if _matches(entry.when, values):
+                    if trace:
+                        out.append(entry.name)
+                        out.extend(values[field] for field in entry.header_fields)
+                    else:
+                        names.append(entry.header.format_map(values))
+            if not trace:
+                out.append("\n'Instruments included: \n")
+                if names:
+                    out.append("'" + ", ".join(names))
+        elif kind == "table_list":
+            names = [table["name"] for table in self.tables
+                     if not table.get("helper") and self._used(("tables", table["name"]), values)]
+            if trace:
+                out.extend(names)
+            else:
+                out.append("\n'Output Data Tables: " + ", ".join(names))
+        elif kind == "lines":
+            lines = []
+            for slot in part["slots"]:
+                self._slot(slot, values, lines, trace)
+            if lines or not part.get("optional"):
+                if not trace:
+                    out.append(part.get("begin", ""))
+                out.extend(lines)
+                if not trace:
+                    out.append(part.get("end", ""))
+        elif kind == "tables":
+            blocks = []
+            for table in self.tables:
+                fields = []
+                self._slot(("tables", table["name"]), values, fields, trace)
+                if not self._used(("tables", table["name"]), values):
+                    continue
+                if trace:
+                    blocks.extend(fields)
+                else:
+                    blocks.append("\n'{0}\nDataTable ({1},1,{2})\n  DataInterval ({3}){4}\nEndTable".format(
+                        table["title"], table["name"], table["size"], table["interval"], "".join(fields)))
+            if trace:
+                out.extend(blocks)
+            else:
+                out.append(part.get("begin", "") + "\n".join(blocks) + "\n")
+        elif kind == "sequences" and sequences is None and values["schedule"] == "auto":
+            if trace:
+                if self._scheduled(values):
+                    out.append("auto")
+                self._render_part(part, values, out, trace, self.sequences)
+            else:
+                for sequence in self._schedule(values):
+                    out.append("\n\nSlowSequence\n\n" + scheduler.scan_statement(sequence.rate) +
+                               "".join(line for task in sequence.tasks for line in task.lines) + "\n\nNextScan")
+        elif kind == "sequences":
+            for sequence in self.sequences if sequences is None else sequences:
+                slot = ("sequences", sequence["name"])
+                if not self._used(slot, values):
+                    continue
+                lines = []
+                self._slot(slot, values, lines, trace)
+                if trace:
+                    out.append(sequence["name"])
+                    out.extend(lines)
+                else:
+                    out.append("\n\nSlowSequence\n\n" + sequence["scan"] + "".join(lines) + "\n\nNextScan")
+        elif not trace:
+            out.append(part["text"])
+        return out
+
+    # Returns whether the scan scheduler has any work to place for the station
+    def _scheduled(self, values):
+        return any(self._used(("sequences", sequence["name"]), values) for sequence in self.sequences) or any(
+            entry.slots["main"].rate is not None and _matches(entry.slots["main"].when, values)
+            for entry in self.entries if "main" in entry.slots)
+
+    # Returns the scheduler's SlowSequences for the station: one task per active sequence section and per
+    # movable main scan section, each priced by scantime with the station's subroutines and String sizes
+    def _schedule(self, values):
+        routines = []
+        self._slot("subroutines", values, routines, False)
+        subroutines = Program("".join(routines)).subroutines
+        declarations = []
+        for slot in ("public", "private"):
+            self._slot(slot, values, declarations, False)
+        strings = string_sizes(Program("".join(declarations)).statements)
+        sections = [(order, entry.slots["main"].rate, entry.slots["main"])
+                    for order, entry in enumerate(self.entries) if "main" in entry.slots]
+        for sequence in self.sequences:
+            if self._used(("sequences", sequence["name"]), values):
+                sections.extend((order, self.intervals[sequence["name"]], entry.slots[("sequences", sequence["name"])])
+                                for order, entry in enumerate(self.entries)
+                                if ("sequences", sequence["name"]) in entry.slots)
+        tasks = []
+        for order, rate, section in sections:
+            if rate is None or not _matches(section.when, values):
+                continue
+            lines = []
+            section.lines.render(values, lines)
+            statements = Program("".join(lines)).statements
+            seconds = sum(estimate_statements(statements, subroutines, self.logger, strings))
+            tasks.append(scheduler.Task(order, rate, seconds,
+                                        frozenset(scheduler.ports(statements, subroutines)), lines,
+                                        section.fallback))
+        return scheduler.schedule(tasks)
+
+    # Returns the station fields a layout part (or the given slow sequences) depends on: those tested or
+    # substituted by the sections it renders
+    def _part_fields(self, part, sequences=None):
+        kind = part["part"]
+        fields = set()
+        if kind == "instruments":
+            for entry in self.header_entries:
+                fields.update(field for field, _ in entry.when)
+                fields.update(entry.header_fields)
+            return tuple(sorted(fields))
+        if kind == "lines":
+            slots = part["slots"]
+        elif kind in ("table_list", "tables"):
+            slots = [("tables", table["name"]) for table in self.tables]
+        elif kind == "sequences":
+            slots = [("sequences", sequence["name"]) for sequence in sequences or self.sequences]
+        else:
+            slots = []
+        for slot in slots:
+            for entry in self.entries:
+                section = entry.slots.get(slot)
+                if section is not None:
+                    fields.update(field for field, _ in section.when)
+                    section.lines.fields(fields)
+                    if section.rate is not None:
+                        fields.add("schedule")
+        return tuple(sorted(fields))
+
+
+class Catalog:
+    def __init__(self, data):
+        self.digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+        try:
+            self.version = data["version"]
+            self.defaults = data["defaults"]
+            blocks = data.get("blocks", {})
+            instruments = data["instruments"]
+            for record in instruments:
+                if "name" not in record:
+                    raise CatalogError("instrument record without a name")
+                _compile_when(record.get("when", {}), record["name"])
+            self.loggers = {logger: LoggerTemplate(logger, spec, instruments, blocks)
+                            for logger, spec in data["loggers"].items()}
+        except (KeyError, TypeError, AttributeError) as e:
+            raise CatalogError("malformed catalog: {0!r}".format(e))
+        missing = set(CHOICES["logger_type"]) - set(self.loggers)
+        if missing:
+            raise CatalogError("no template for logger " + ", ".join(sorted(missing)))
+        for field, value in self.defaults.items():
+            _check_value(field, value, "defaults")
+
+    # Station values the template of config's logger is rendered with
+    def values(self, config):
+        return self.loggers[config.logger_type].fix(config.as_dict())
+
+    # Returns the program body for config as a list of strings, reusing sections from fragments (a
+    # FragmentCache) and recording them in profile (a SectionProfile) when given
+    def render(self, config, fragments=None, profile=None):
+        return self.loggers[config.logger_type].render(self.values(config), fragments=fragments, profile=profile)
+
+    # Returns a tuple that two configs of the same logger share exactly when their bodies are identical:
+    # the outcome of every condition the template evaluates and every value it substitutes
+    def signature(self, config):
+        return tuple(self.loggers[config.logger_type].render(self.values(config), trace=True))
@@ -0,0 +1,110 @@
+# config.py
+# Immutable description of one station, i.e. everything the GUI form asks for. A StationConfig holds no
+# reference to Tkinter so it can be built by the GUI, the batch generator, or any other tool and be
+# shared freely between threads and processes.
+
+import re
+from dataclasses import dataclass, asdict, replace
+
+# Values offered by the GUI drop downs
+LOGGER_TYPES = ('CR1000X', 'CR1000', 'CR3XX')
+WIND_TYPES = ('Regular', 'HD')
+TEMP_TYPES = ('Legacy/HMP60', 'CS215-in-datalogger', 'CS215-in-CS125', 'HygroVUE5/10')
+RS_TYPES = ('Vaisala', 'IceSight', 'None')
+SUBPROBE_TYPES = ('107', '108', '109', 'None')
+SNOW_TYPES = ('SnowVue', 'SR50', 'None')
+
+# Checkbox fields, each 1 or 0
+FLAGS = ("RS_com", "CS125", "TE525", "pyro", "CS655", "CC640", "light")
+# Drop down fields and the values each one accepts
+CHOICES = {"logger_type": LOGGER_TYPES, "wind": WIND_TYPES, "temp": TEMP_TYPES, "RS": RS_TYPES,
+           "subprobe": SUBPROBE_TYPES, "Snow": SNOW_TYPES}
+# Generator options, which are not on the GUI form, and the values each one accepts. The first value is
+# the default and generates the same program as before the option existed.
+OPTIONS = {"schedule": ("fixed", "auto"), "sdi12": ("sequential", "concurrent"), "serial": ("delay", "response"),
+           "parse": ("per-field", "once"), "constants": ("keep", "fold"),
+           "dead_variables": ("keep", "drop"), "wetbulb": ("bisection", "stull", "newton", "output"),
+           "two_minute": ("table", "running"), "status_tables": ("interval", "change"),
+           "field_types": ("keep", "narrow"),
+           "table_size": ("fixed", "auto")}
+
+_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+# Raised when a station's inputs can not be used to generate a program
+class ConfigError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class StationConfig:
+    username: str
+    date: str           # MMDDYY
+    site_name: str
+    logger_type: str
+    wind: str
+    temp: str
+    RS: str
+    subprobe: str
+    Snow: str
+    RS_com: int = 0     # 1 if the road sensor talks over radio
+    Snow_const: str = "0"
+    CS125: int = 0
+    TE525: int = 0
+    pyro: int = 0       # LI200X
+    CS655: int = 0
+    CC640: int = 0
+    light: int = 0      # SW12V
+    # Generator options (see OPTIONS)
+    schedule: str = "fixed"     # "auto" lets the scan scheduler place slow work in slow sequences
+    sdi12: str = "sequential"   # "concurrent" starts SDI-12 measurements with C! instead of waiting on M!
+    serial: str = "delay"       # "response" reads serial sensors when they answer instead of after a Delay
+    parse: str = "per-field"    # "once" splits the DSC/DST message once instead of searching it per field
+    constants: str = "keep"     # "fold" resolves Ifs on instrument Consts when generating instead of at run time
+    dead_variables: str = "keep"  # "drop" removes the variables, aliases, units and fields nothing uses
+    wetbulb: str = "bisection"  # how the wet-bulb temperature is found: "stull", "newton" or once per "output"
+    two_minute: str = "table"   # "running" averages the two minute wind in the main scan, without the TwoMinute table
+    status_tables: str = "interval"  # "change" records status fields in tables written when they change
+    field_types: str = "keep"   # "narrow" writes table fields in the smallest type their range and resolution allow
+    table_size: str = "fixed"   # "auto" sizes the data tables for retention_days of data
+    retention_days: int = 30    # days of data table_size "auto" and the diagnostics table size the tables for
+    # Names of the variables the collection system reads; when given, every other Public variable is a Dim
+    polled: tuple = ()
+    # Minutes between the records of the Diagnostics table of scan times (see diagnostics.py); 0 leaves it out
+    diagnostics: int = 0
+
+    # A polled list (from JSON, say) is stored as a tuple so the config stays hashable
+    def __post_init__(self):
+        if isinstance(self.polled, list):
+            object.__setattr__(self, "polled", tuple(self.polled))
+
+    # Checks the same things StationGui.validate() does plus the drop down and option values. Raises
+    # ConfigError.
+    def validate(self):
+        if "" in (self.username, self.date, self.site_name, self.logger_type, self.wind, self.temp, self.RS,
+                  self.Snow, self.subprobe):
+            raise ConfigError("Not enough input")
+        if len(self.date) != 6:
+            raise ConfigError("Date is not in MMDDYY format")
+        for field, choices in list(CHOICES.items()) + list(OPTIONS.items()):
+            if getattr(self, field) not in choices:
+                raise ConfigError("Unknown {0}: {1}".format(field, getattr(self, field)))
+        for field in FLAGS:
+            if getattr(self, field) not in (0, 1):
+                raise ConfigError("{0} must be 0 or 1".format(field))
+        if not isinstance(self.retention_days, int) or not 1 <= self.retention_days <= 3650:
+            raise ConfigError("retention_days must be a number of days from 1 to 3650")
+        if not isinstance(self.diagnostics, int) or not 0 <= self.diagnostics <= 1440:
+            raise ConfigError("diagnostics must be a number of minutes from 0 to 1440")
+        if not isinstance(self.polled, tuple):
+            raise ConfigError("polled must be a list of variable names")
+        for name in self.polled:
+            if not isinstance(name, str) or not _NAME.match(name):
+                raise ConfigError("Not a variable name: {0}".format(name))
+        return self
+
+    def as_dict(self):
+        return asdict(self)
+
+    def replace(self, **changes):
+        return replace(self, **changes)
@@ -0,0 +1,79 @@
+# diagnostics.py
+# On-logger record of how the program keeps up in the field. The diagnostics pass (a station's
+# "diagnostics" interval in minutes) adds a Diagnostics table with a record every interval. It samples
+# the logger's Status table every main scan into Dim variables. The main scan gets its
+# process time (average and maximum), measure time and skipped scan count. Each SlowSequence, numbered as
+# the Status table numbers them, gets its process time (average and maximum) and skipped scan count. The
+# table also keeps the largest pipeline buffer depth.
+#
+# Field names are the same on every station: <scan>_<value> with scan Main or Slow<N>, then the output
+# instruction's suffix (Main_ProcTime_Avg, Slow2_Skipped, BuffDepth_Max). Times are in microseconds as the
+# Status table reports them, and skipped scans are the running counts since the program was compiled. The
+# Status table has no measure time for slow sequences.
+
+import math
+
+from crbasic.program import Program
+from crbasic.storage import RECORD_OVERHEAD, TYPE_BYTES, check_tables, free_bytes, plan_tables
+
+# Name of the diagnostics table
+TABLE = "Diagnostics"
+
+
+# The table's variables with the Status field each is copied from and its output instructions
+def _fields(sequences):
+    fields = [("Main_ProcTime", "Status.ProcessTime", ("Average ({0},{1},IEEE4,False)",
+                                                       "Maximum ({0},{1},IEEE4,False,False)")),
+              ("Main_MeasTime", "Status.MeasureTime", ("Sample ({0},{1},IEEE4)",)),
+              ("Main_Skipped", "Status.SkippedScan", ("Sample ({0},{1},Long)",))]
+    for n in range(1, sequences + 1):
+        fields += [("Slow{0}_ProcTime".format(n), "Status.SlowProcTime({0})".format(n),
+                    ("Average ({0},{1},IEEE4,False)", "Maximum ({0},{1},IEEE4,False,False)")),
+                   ("Slow{0}_Skipped".format(n), "Status.SkippedSlowScan({0})".format(n), ("Sample ({0},{1},Long)",))]
+    fields.append(("BuffDepth", "Status.BuffDepth", ("Maximum ({0},{1},IEEE4,False,False)",)))
+    return fields
+
+
+# Diagnostics pass. Declares the table's variables and adds the table after the last DataTable. After the
+# main scan's other CallTables it copies the Status fields into the variables and calls the table. The
+# table is listed as an output data table and holds retention_days of records, or fewer if that would not
+# leave the auto-allocated tables their retention_days (see storage.free_bytes). Raises
+# storage.StorageError if an auto-allocated table would get no records.
+def diagnostics_table(body, minutes, logger, retention_days):
+    program = Program(body)
+    main = next((scan for scan in program.scans if scan.name == "main scan"), None)
+    tables = [statement for statement in program.statements if statement.instruction == "datatable"]
+    if not minutes or main is None or not tables:
+        return body
+    lines = program.lines
+    fields = _fields(len(program.scans) - 1)
+    first_table = tables[0].number
+    last_declaration = max(statement.number for statement in program.statements
+                           if statement.instruction in ("public", "dim", "alias") and statement.number < first_table)
+    last_table = max(statement.number for statement in program.statements
+                     if statement.instruction == "endtable" and statement.number < main.first)
+    declarations = ["Dim " + name + (" As Long" if outputs[0].endswith("Long)") else "") for name, _, outputs in fields]
+    record = RECORD_OVERHEAD + TYPE_BYTES["ieee4"] * sum(len(outputs) for _, _, outputs in fields)
+    retention = math.ceil(retention_days * 1440 / minutes)
+    size = max(1, min(retention, int(free_bytes(plan_tables(body, logger), logger, retention_days) // record)))
+    insert = {last_declaration: declarations,
+              last_table: ["", "'{0} table (scan times from the Status table)".format(TABLE),
+                           "DataTable ({0},1,{1})".format(TABLE, size),
+                           "  DataInterval (0,{0},Min,10)".format(minutes)]}
+    insert[last_table] += ["  " + output.format(1, name) for name, _, outputs in fields for output in outputs]
+    insert[last_table].append("EndTable")
+    calls = [statement.number for statement in main.statements if statement.instruction == "calltable"]
+    after = calls[-1] if calls else main.statements[-1].number
+    indent = lines[after][:len(lines[after]) - len(lines[after].lstrip())]
+    insert[after] = [indent + "{0} = {1}".format(name, status) for name, status, _ in fields]
+    insert[after].append(indent + "CallTable " + TABLE)
+
+    out = []
+    for number, line in enumerate(lines):
+        if line.startswith("'Output Data Tables:"):
+            line = line.rstrip() + ", " + TABLE
+        out.append(line)
+        out.extend(insert.get(number, []))
+    text = "\n".join(out)
+    check_tables(text, logger)
+    return text
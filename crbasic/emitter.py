@@ -0,0 +1,43 @@
+# emitter.py
+# In-memory program buffer and atomic file output. A program is assembled in a ProgramBuffer and saved
+# with one write to a temporary file in the destination folder, which is fsynced and then renamed over
+# the final name. A crash part way through never leaves a truncated program behind.
+
+import os
+import tempfile
+
+
+# Collects program text in memory. writelines() takes a string or a list of strings, like a file.
+class ProgramBuffer:
+    def __init__(self):
+        self.parts = []
+
+    def writelines(self, text):
+        if isinstance(text, str):
+            self.parts.append(text)
+        else:
+            self.parts.extend(text)
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+# Writes text (or bytes) to path in a single write call. The text goes to a temporary file next to path
+# that is flushed, fsynced and renamed into place, so path holds either the old program or the new one.
+def write_atomic(path, text):
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "wb" if isinstance(text, bytes) else "w") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file private to the user; give it the permissions a plain open() would
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,44 @@
+# fragments.py
+# Bounded memo of rendered program sections. Every section of a program (instrument list, constants,
+# declarations, data tables, subroutines, main scan, each slow sequence) depends on only a few station
+# inputs, so in a batch most sections come out the same for many sites. The catalog renders a section
+# once per distinct combination of the inputs it depends on and keeps it here; the least recently used
+# sections are dropped once the cache is full.
+
+import threading
+from collections import OrderedDict
+
+
+class FragmentCache:
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.fragments = OrderedDict()
+        self.lock = threading.Lock()
+
+    # Returns the fragment stored under key, calling render() to create it on a miss
+    def get(self, key, render):
+        with self.lock:
+            text = self.fragments.get(key)
+            if text is not None:
+                self.fragments.move_to_end(key)
+                self.hits += 1
+                return text
+            self.misses += 1
+        text = render()
+        with self.lock:
+            self.fragments[key] = text
+            if len(self.fragments) > self.maxsize:
+                self.fragments.popitem(last=False)
+        return text
+
+    def clear(self):
+        with self.lock:
+            self.fragments.clear()
+            self.hits = 0
+            self.misses = 0
+
+    # Hit/miss counters and current size, e.g. for a batch summary
+    def info(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.fragments), "maxsize": self.maxsize}
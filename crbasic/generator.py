@@ -0,0 +1,140 @@
+# generator.py
+# Builds RWIS CRBasic programs from a StationConfig. generate() is a pure function of its config: it keeps
+# no state between calls and never touches Tkinter, so the GUI, the batch generator and any other tool
+# (or several threads at once) can call it. The instruments and the CRBasic they need are described in
+# the sensor catalog (see catalog.py and catalog.json); this module only stamps the header, renders the
+# catalog template of the station's logger and runs the optimization passes (optimize.py) the station's
+# options ask for (after adding the diagnostics table if the station has an interval for it), then
+# declares the variables the collection system does not poll with Dim.
+
+import os
+from dataclasses import fields
+
+from crbasic.catalog import get_catalog
+from crbasic.config import StationConfig
+from crbasic.diagnostics import diagnostics_table
+from crbasic.emitter import ProgramBuffer, write_atomic
+from crbasic.fragments import FragmentCache
+from crbasic.optimize import PASSES, demote_public
+from crbasic.storage import StorageError
+
+# Bump whenever a change to the generator changes the programs it writes (invalidates cached programs)
+GENERATOR_VERSION = "2"
+
+# Program file extension and header name for each logger type
+EXTENSIONS = {"CR1000X": "CR1X", "CR1000": "CR1", "CR3XX": "CR300"}
+LOGGER_NAMES = {"CR1000X": "CR1000X", "CR1000": "CR1000", "CR3XX": "CR300"}
+
+# Default value of every StationConfig field
+FIELD_DEFAULTS = {field.name: field.default for field in fields(StationConfig)}
+
+# Rendered program sections shared by every generate() call in this process (see fragments.py)
+FRAGMENTS = FragmentCache()
+
+
+# Returns the file name a station's program is saved under
+def program_filename(config):
+    return "{0}_{1}_Auto.{2}".format(config.site_name, config.date, EXTENSIONS[config.logger_type])
+
+
+# Returns the first two lines of a program, the only part that depends on the site name, date and user
+def program_header(config):
+    month = config.date[0:2]
+    day = config.date[2:4]
+    year = config.date[4:6]
+    return ("'{0} program automatically generated by RWISPrograms.py on {1}/{2}/{3} for {4} \n"
+            "'Generator: {5} \n").format(LOGGER_NAMES[config.logger_type], month, day, year, config.site_name,
+                                         config.username)
+
+
+# Returns the simplest StationConfig that generates the same program as config. Inputs the logger fixes
+# in the catalog (everything on the CR1000, which only gets a header for now, and all but the anemometer
+# and subprobe on the CR3XX) are set to their fixed values, then every other input is reset to its
+# catalog default ("None"/0) whenever that leaves the program unchanged, e.g. RS_com without a Vaisala
+# road sensor or Snow_const without a snow depth sensor. Last, the options of the steps after the catalog
+# (diagnostics, the optimization passes and polled) go back to their defaults if their step leaves the
+# program unchanged, e.g. every option on the CR1000 or polled naming every Public variable (this runs the
+# steps, so steps=False keeps the options as they are when that costs too much), and retention_days goes
+# back to its default unless the table size pass or the diagnostics table use it. Equivalent stations
+# therefore canonicalize to the same config and their programs only need to be generated once.
+def canonicalize(config, steps=True):
+    catalog = get_catalog()
+    changes = dict(catalog.loggers[config.logger_type].fixed)
+    changes = {field: value for field, value in changes.items() if getattr(config, field) != value}
+    canonical = config.replace(**changes) if changes else config
+    signature = catalog.signature(canonical)
+    for field, value in catalog.defaults.items():
+        if getattr(canonical, field) == value:
+            continue
+        candidate = canonical.replace(**{field: value})
+        if catalog.signature(candidate) == signature:
+            canonical = candidate
+    if steps and next(_steps(canonical), None) is not None:
+        try:
+            _, inert = _optimize(canonical, catalog.render(canonical, FRAGMENTS))
+        except StorageError:
+            inert = ()
+        if inert:
+            canonical = canonical.replace(**{field: FIELD_DEFAULTS[field] for field in inert})
+    if canonical.table_size == FIELD_DEFAULTS["table_size"] and not canonical.diagnostics:
+        if canonical.retention_days != FIELD_DEFAULTS["retention_days"]:
+            canonical = canonical.replace(retention_days=FIELD_DEFAULTS["retention_days"])
+    return canonical
+
+
+# Generates the station's program and saves it in the folder at path. Returns the program's filename.
+def generate_program(config, path):
+    return save_program(config, path, generate(config))
+
+
+# Saves the program text generated for the station in the folder at path, so a caller that also checks
+# the text (e.g. estimates its scans) generates it only once. Returns the program's filename.
+def save_program(config, path, text):
+    os.makedirs(path, exist_ok=True)
+    filename = program_filename(config)
+    write_atomic(os.path.join(path, filename), text)
+    return filename
+
+
+# Returns the full CRBasic program text for a station. If profile (a profiling.SectionProfile) is given,
+# the time, lines and bytes of every program section are recorded in it.
+def generate(config, profile=None):
+    program = ProgramBuffer()
+    if profile is None:
+        program.writelines(program_header(config))
+    else:
+        program.writelines(profile.measure("header", lambda: program_header(config)))
+    body, _ = _optimize(config, get_catalog().render(config, FRAGMENTS, profile), profile)
+    program.writelines(body)
+    return program.getvalue()
+
+
+# The steps after the catalog that the station's options ask for, in order: the diagnostics table (first,
+# so the table size pass sizes it with the others), the optimization passes and the Public variable
+# demotion. Yields the option field, the step's name, the arguments its result depends on besides the
+# text and the step itself.
+def _steps(config):
+    logger = config.logger_type
+    if config.diagnostics:
+        yield ("diagnostics", "diagnostics table", (logger, config.diagnostics, config.retention_days),
+               lambda text: diagnostics_table(text, config.diagnostics, logger, config.retention_days))
+    for field, value, name, optimize, extra in PASSES:
+        if getattr(config, field) == value:
+            args = (logger,) + tuple(getattr(config, name) for name in extra)
+            yield field, name, args, lambda text, optimize=optimize, args=args: optimize(text, *args)
+    if config.polled:
+        yield "polled", "public variables", (config.polled,), lambda text: demote_public(text, config.polled)
+
+
+# Runs the station's steps over the rendered body. Returns the resulting body and the option fields whose
+# step left its input unchanged (leaving those steps out gives the same program).
+def _optimize(config, body, profile=None):
+    inert = []
+    for field, name, args, step in _steps(config):
+        # Many stations share a body, so each step's result is memoized with the sections
+        text = "".join(body)
+        render = lambda: FRAGMENTS.get((name,) + args + (text,), lambda: step(text))
+        body = [render() if profile is None else profile.measure(name, render)]
+        if body[0] == text:
+            inert.append(field)
+    return body, inert
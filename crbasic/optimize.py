@@ -0,0 +1,287 @@
+# optimize.py
+# Optimization passes over a generated program's text. The catalog adds an instrument's declarations
+# whether or not the rest of the program needs them (the CS125 block, for example, is declared on every
+# CR1000X so the "No CS125" lines can assign NAN to a few of its variables), so a program carries Public
+# and Dim variables, aliases, units and table fields that nothing reads or writes. It also tests some
+# instrument flags at run time (If solar_exist = 1) although their Const value is known when the program
+# is generated. A pass takes the program body (everything after the two header lines), the logger type and
+# the station fields PASSES lists for it, and returns the optimized body; PASSES lists them with the
+# station option that turns each one on (the event table and output type passes are in telemetry.py and the
+# table size pass in storage.py).
+
+import re
+
+from crbasic.program import parse_statement, split_args, strip_comment
+from crbasic.storage import size_tables
+from crbasic.telemetry import event_tables, narrow_fields
+
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_THEN = re.compile(r"\bthen\b", re.IGNORECASE)
+_CONST = re.compile(r"const\s+([A-Za-z_][A-Za-z0-9_]*)\s*=\s*(-?[0-9.]+)$", re.IGNORECASE)
+_OPERAND = r"\s*([A-Za-z_][A-Za-z0-9_]*|-?[0-9.]+)\s*"
+_COMPARISON = re.compile("^" + _OPERAND + "(<>|<=|>=|=|<|>)" + _OPERAND + "$")
+_COMPARE = {"=": lambda a, b: a == b, "<>": lambda a, b: a != b, "<": lambda a, b: a < b, ">": lambda a, b: a > b,
+            "<=": lambda a, b: a <= b, ">=": lambda a, b: a >= b}
+_STRING = re.compile(r'"[^"]*"')
+# Table statements that are not output instructions
+_TABLE_SETUP = ("datatable", "endtable", "datainterval", "openinterval", "cardout", "tablefile", "fillstop")
+
+
+# Lower case identifiers of a statement's code, leaving out string literals
+def _names(code):
+    return {name.lower() for name in _WORD.findall(_STRING.sub("", code))}
+
+
+# Name of a declared item ("x(16) As String" -> "x")
+def _declared(item):
+    match = _WORD.match(item.strip())
+    return match.group(0).lower() if match else None
+
+
+# Removes the Public and Dim variables that no statement reads or writes, together with their aliases,
+# units and the data table fields that output them. A variable is used when it (or one of its aliases)
+# appears anywhere but in a declaration, an Alias, a Units line or a table output instruction; table
+# output on its own does not keep a variable that is never written. A table whose fields would all go
+# keeps them, so no table is left empty.
+def eliminate_dead_variables(body, logger=None):
+    lines = body.split("\n")
+    statements = [parse_statement(number, line) for number, line in enumerate(lines)]
+    kinds = []
+    groups = {}
+    table = None
+    for statement in statements:
+        kind = None
+        if statement is not None:
+            instruction = statement.instruction
+            if instruction == "datatable":
+                table = []
+            if instruction in ("public", "dim"):
+                kind = "declare"
+                for item in split_args(statement.code[len(instruction):]):
+                    name = _declared(item)
+                    if name:
+                        groups.setdefault(name, {name})
+            elif instruction == "alias":
+                kind = "alias"
+                target, _, alias = statement.code[len(instruction):].partition("=")
+                base, name = _declared(target), _declared(alias)
+                if base and name:
+                    groups.setdefault(base, {base}).add(name)
+            elif instruction == "units":
+                kind = "units"
+            elif table is not None and instruction not in _TABLE_SETUP:
+                kind = "field"
+            if instruction == "endtable":
+                table = None
+        kinds.append(kind)
+
+    used = set()
+    for statement, kind in zip(statements, kinds):
+        if kind is None and statement is not None:
+            used |= _names(statement.code)
+    owner = {name: base for base, names in groups.items() for name in names}
+    dead = {name for base, names in groups.items() if not names & used for name in names}
+    if not dead:
+        return body
+
+    drop = set()
+    table = []
+    for number, (line, kind, statement) in enumerate(zip(lines, kinds, statements)):
+        if statement is not None and statement.instruction == "datatable":
+            table = []
+        if kind == "field":
+            names = {name for name in _names(statement.code) if name in owner}
+            table.append((number, names and names <= dead))
+        elif kind == "units":
+            name = _declared(statement.code[len("units"):].partition("=")[0])
+            if name in dead:
+                drop.add(number)
+        elif kind == "alias":
+            if _declared(statement.code[len("alias"):].partition("=")[2]) in dead:
+                drop.add(number)
+        elif kind == "declare":
+            items = split_args(statement.code[len(statement.instruction):])
+            kept = [item for item in items if _declared(item) not in dead]
+            if not kept:
+                drop.add(number)
+            elif len(kept) < len(items):
+                indent = line[:len(line) - len(line.lstrip())]
+                comment = line[len(strip_comment(line)):]
+                lines[number] = "{0}{1} {2}{3}".format(indent, statement.code.split()[0], ", ".join(kept),
+                                                       " " + comment if comment else "")
+        if statement is not None and statement.instruction == "endtable":
+            if not all(dead_field for _, dead_field in table):
+                drop.update(number for number, dead_field in table if dead_field)
+            table = []
+    return "\n".join(line for number, line in enumerate(lines) if number not in drop)
+
+
+# Condition and inline statement of an If/ElseIf statement ("If x = 1 Then y = 2" -> ("x = 1", "y = 2"))
+def _condition(statement):
+    rest = statement.code[len(statement.instruction):]
+    then = _THEN.search(rest)
+    if then is None:
+        return rest.strip(), ""
+    return rest[:then.start()].strip(), rest[then.end():].strip()
+
+
+# Value of a condition that only compares constants and numbers, or None if it is not known before run time
+def _evaluate(condition, consts):
+    match = _COMPARISON.match(condition)
+    if match is None:
+        return None
+    operands = []
+    for operand in (match.group(1), match.group(3)):
+        value = consts.get(operand.lower())
+        if value is None:
+            try:
+                value = float(operand)
+            except ValueError:
+                return None
+        operands.append(value)
+    return _COMPARE[match.group(2)](*operands)
+
+
+# The branches of the block If starting at index: a list of (condition or None for Else, first line,
+# end line) and the index of its EndIf
+def _branches(statements, index):
+    branches = [[_condition(statements[index])[0], index + 1, None]]
+    depth = 0
+    for number in range(index + 1, len(statements)):
+        statement = statements[number]
+        if statement is None:
+            continue
+        instruction = statement.instruction
+        if instruction == "if" and not _condition(statement)[1]:
+            depth += 1
+        elif instruction == "endif" and depth:
+            depth -= 1
+        elif depth == 0 and instruction in ("elseif", "else", "endif"):
+            branches[-1][2] = number
+            if instruction == "endif":
+                return branches, number
+            branches.append([_condition(statement)[0] if instruction == "elseif" else None, number + 1, None])
+    return None, None
+
+
+# Folds the Ifs of lines whose conditions are known, given the constants' values
+def _fold(lines, consts):
+    statements = [parse_statement(number, line) for number, line in enumerate(lines)]
+    out = []
+    index = 0
+    while index < len(lines):
+        statement = statements[index]
+        if statement is None or statement.instruction != "if":
+            out.append(lines[index])
+            index += 1
+            continue
+        condition, inline = _condition(statement)
+        indent = lines[index][:len(lines[index]) - len(lines[index].lstrip())]
+        if inline:
+            value = _evaluate(condition, consts)
+            if value is None:
+                out.append(lines[index])
+            elif value:
+                out.append(indent + inline)
+            index += 1
+            continue
+        branches, end = _branches(statements, index)
+        values = [True if branch[0] is None else _evaluate(branch[0], consts) for branch in branches or ()]
+        if not branches or None in values:
+            out.append(lines[index])
+            index += 1
+            continue
+        for (_, first, last), value in zip(branches, values):
+            if value:
+                body = _fold(lines[first:last], consts)
+                depth = min((len(line) - len(line.lstrip()) for line in body if line.strip()), default=0)
+                shift = max(0, depth - len(indent))
+                out.extend(line if line[:shift].strip() else line[shift:] for line in body)
+                break
+        index = end + 1
+    return out
+
+
+# Replaces the If blocks and single line Ifs whose condition only compares numeric constants (Const x = 1)
+# and numbers by the branch that would run, then removes the constants nothing refers to any more
+def fold_constants(body, logger=None):
+    lines = body.split("\n")
+    consts = {}
+    for number, line in enumerate(lines):
+        match = _CONST.match(strip_comment(line).strip())
+        if match:
+            try:
+                consts[match.group(1).lower()] = (float(match.group(2)), number)
+            except ValueError:
+                pass
+    if not consts:
+        return body
+    folded = _fold(lines, {name: value for name, (value, _) in consts.items()})
+    if folded == lines:
+        return body
+    used = set()
+    for line in folded:
+        statement = parse_statement(0, line)
+        if statement is not None and not _CONST.match(statement.code):
+            used |= _names(statement.code)
+    unused = {lines[number] for name, (_, number) in consts.items() if name not in used}
+    return "\n".join(line for line in folded if line not in unused)
+
+
+# Declares every Public variable the collection system does not read (polled: the variable or alias names
+# it polls) with Dim instead, so the Public table a client polls only holds those. A variable stays Public
+# when it or one of its aliases is polled; its other items move to a Dim statement after it.
+def demote_public(body, polled):
+    polled = {name.lower() for name in polled}
+    lines = body.split("\n")
+    statements = [parse_statement(number, line) for number, line in enumerate(lines)]
+    aliases = {}
+    for statement in statements:
+        if statement is not None and statement.instruction == "alias":
+            target, _, alias = statement.code[len("alias"):].partition("=")
+            aliases.setdefault(_declared(target), set()).add(_declared(alias))
+    out = []
+    for line, statement in zip(lines, statements):
+        if statement is None or statement.instruction != "public":
+            out.append(line)
+            continue
+        items = split_args(statement.code[len("public"):])
+        kept = [item for item in items if ({_declared(item)} | aliases.get(_declared(item), set())) & polled]
+        demoted = [item for item in items if item not in kept]
+        indent = line[:len(line) - len(line.lstrip())]
+        comment = line[len(strip_comment(line)):]
+        if kept:
+            out.append(line if not demoted else "{0}{1} {2}{3}".format(
+                indent, statement.code.split()[0], ", ".join(kept), " " + comment if comment else ""))
+        if demoted and not kept:
+            out.append(indent + "Dim" + line.lstrip()[len("public"):])
+        elif demoted:
+            out.append("{0}Dim {1}".format(indent, ", ".join(demoted)))
+    return "\n".join(out)
+
+
+# The polled names that are neither a Public variable of the body nor an alias of one (demote_public would
+# demote every variable they were meant to keep), in the given order
+def unknown_polled(body, polled):
+    public = set()
+    aliases = set()
+    for line in body.split("\n"):
+        statement = parse_statement(0, line)
+        if statement is None:
+            continue
+        if statement.instruction == "public":
+            public.update(_declared(item) for item in split_args(statement.code[len("public"):]))
+        elif statement.instruction == "alias":
+            target, _, alias = statement.code[len("alias"):].partition("=")
+            aliases.add((_declared(target), _declared(alias)))
+    known = public | {alias for target, alias in aliases if target in public}
+    return [name for name in polled if name.lower() not in known]
+
+
+# Optimization passes in the order they run: the station option and value that turn a pass on, its name
+# in section profiles, the pass and the station fields it takes after the logger type
+PASSES = (("constants", "fold", "constant folding", fold_constants, ()),
+          ("dead_variables", "drop", "dead variables", eliminate_dead_variables, ()),
+          ("status_tables", "change", "event tables", event_tables, ()),
+          ("field_types", "narrow", "output types", narrow_fields, ()),
+          ("table_size", "auto", "table sizes", size_tables, ("retention_days",)))
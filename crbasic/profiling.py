@@ -0,0 +1,60 @@
+# profiling.py
+# Opt-in per-section instrumentation of the generator. Pass a SectionProfile to generate() and it records,
+# for every section of the program (header, instrument list, constants, declarations, units, data tables,
+# subroutines, main scan and each SlowSequence), how often it was produced, the wall time spent on it and
+# the lines and bytes it emitted. Profiles of single programs can be merged into a batch total and saved
+# as JSON; format_summary() gives the table printed by the batch generator.
+
+import time
+
+# Per-section counters, in this order in as_dict()
+COUNTERS = ("calls", "seconds", "lines", "bytes")
+
+
+class SectionProfile:
+    def __init__(self):
+        self.sections = {}
+
+    # Records one section that took seconds and produced text
+    def add(self, section, seconds, text):
+        counters = self.sections.get(section)
+        if counters is None:
+            counters = self.sections[section] = [0, 0.0, 0, 0]
+        counters[0] += 1
+        counters[1] += seconds
+        counters[2] += text.count("\n")
+        counters[3] += len(text.encode("utf-8"))
+
+    # Times the call render() and records the text it returns under section. Returns the text.
+    def measure(self, section, render):
+        start = time.perf_counter()
+        text = render()
+        self.add(section, time.perf_counter() - start, text)
+        return text
+
+    # Adds the counters of another profile (or of its as_dict()) to this one
+    def merge(self, other):
+        sections = other.as_dict() if isinstance(other, SectionProfile) else other
+        for section, values in sections.items():
+            counters = self.sections.get(section)
+            if counters is None:
+                counters = self.sections[section] = [0, 0.0, 0, 0]
+            for n, name in enumerate(COUNTERS):
+                counters[n] += values[name]
+        return self
+
+    def as_dict(self):
+        return {section: dict(zip(COUNTERS, counters)) for section, counters in self.sections.items()}
+
+
+# Returns a text table of a profile: one row per section, slowest total first
+def format_summary(profile):
+    sections = profile.as_dict()
+    total = sum(values["seconds"] for values in sections.values()) or 1.0
+    rows = ["{0:<26} {1:>7} {2:>10} {3:>9} {4:>9} {5:>11} {6:>6}".format(
+        "Section", "Calls", "Total ms", "Mean us", "Lines", "Bytes", "Time")]
+    for section, values in sorted(sections.items(), key=lambda item: -item[1]["seconds"]):
+        rows.append("{0:<26} {1:>7} {2:>10.2f} {3:>9.1f} {4:>9} {5:>11} {6:>5.1f}%".format(
+            section, values["calls"], values["seconds"] * 1000, values["seconds"] * 1e6 / values["calls"],
+            values["lines"], values["bytes"], values["seconds"] * 100 / total))
+    return "\n".join(rows) + "\n"
@@ -0,0 +1,114 @@
+# program.py
+# Reads back the structure of a generated CRBasic program so it can be checked and optimized after
+# generation: its subroutines, its main scan and slow sequence scans, and the instruction and arguments
+# of every statement. CRBasic is case insensitive, so names are compared in lower case.
+
+import re
+from collections import namedtuple
+
+# Seconds per CRBasic interval unit
+UNITS = {"usec": 1e-6, "msec": 1e-3, "sec": 1.0, "min": 60.0, "hr": 3600.0}
+
+# One statement: its line number (0 based) in the program, the code without comment or indentation, the
+# instruction (first word, lower case) and its argument list
+Statement = namedtuple("Statement", "number code instruction args")
+# A Scan ... NextScan block: "main scan" or "SlowSequence N", interval in seconds and its statements
+ScanBlock = namedtuple("ScanBlock", "name interval statements first last")
+
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+# Returns line without its trailing ' comment (a ' inside a string does not start a comment)
+def strip_comment(line):
+    if '"' not in line:
+        return line.partition("'")[0]
+    quoted = False
+    for n, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == "'" and not quoted:
+            return line[:n]
+    return line
+
+
+# Splits an argument list at the commas that are not inside quotes or parentheses
+def split_args(text):
+    args = []
+    depth = 0
+    quoted = False
+    start = 0
+    for n, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            args.append(text[start:n].strip())
+            start = n + 1
+    args.append(text[start:].strip())
+    return args
+
+
+# Parses one line into a Statement, or returns None for blank and comment lines
+def parse_statement(number, line):
+    code = strip_comment(line).strip()
+    if not code:
+        return None
+    match = _WORD.match(code)
+    if match is None:
+        return Statement(number, code, "", [])
+    instruction = match.group(0).lower()
+    rest = code[match.end():].lstrip()
+    args = []
+    if rest.startswith("(") and instruction not in ("if", "elseif"):
+        depth = 0
+        for n, char in enumerate(rest):
+            depth += char == "("
+            depth -= char == ")"
+            if depth == 0:
+                args = split_args(rest[1:n])
+                break
+    elif instruction in ("call", "calltable"):
+        args = [rest.strip()]
+    return Statement(number, code, instruction, args)
+
+
+# Interval in seconds of a Scan (interval,unit,...) statement
+def scan_interval(statement):
+    return float(statement.args[0]) * UNITS[statement.args[1].lower()]
+
+
+class Program:
+    def __init__(self, text):
+        self.text = text
+        self.lines = text.split("\n")
+        self.statements = [statement for statement in (parse_statement(n, line) for n, line in enumerate(self.lines))
+                           if statement is not None]
+        self.subroutines = {}
+        self.scans = []
+        sub = None
+        scan = None
+        slow = 0
+        for statement in self.statements:
+            instruction = statement.instruction
+            if instruction == "sub":
+                sub = statement.code.split()[1].lower()
+                self.subroutines[sub] = []
+            elif instruction == "endsub":
+                sub = None
+            elif sub is not None:
+                self.subroutines[sub].append(statement)
+            elif instruction == "slowsequence":
+                slow += 1
+            elif instruction == "scan":
+                name = "SlowSequence {0}".format(slow) if slow else "main scan"
+                scan = ScanBlock(name, scan_interval(statement), [], statement.number, None)
+            elif instruction == "nextscan" and scan is not None:
+                self.scans.append(scan._replace(last=statement.number))
+                scan = None
+            elif scan is not None:
+                scan.statements.append(statement)
@@ -0,0 +1,252 @@
+# scantime.py
+# Static scan-time estimate of a generated program. Every statement of the main scan and of each slow
+# sequence is priced with a per-instruction cost model: analog measurements by their settling and
+# integration times, SDI-12 by the sensor's measurement time, serial I/O and Delay by their timeouts,
+# SplitStr by the declared size of the string it searches and the values it splits out, and processing by
+# a small per-statement cost. For loops count every iteration, If and Select Case blocks their most
+# expensive branch and Call the subroutine's statements, so the result is a worst case. A scan whose
+# estimate exceeds its interval would skip scans in the field. Each scan also gets its average process
+# time, which prices an If on TimeIntoInterval by the share of scans that run it.
+#
+# The costs are rough CR1000X figures (other loggers scale processing by PROCESS_SPEED); they are meant to
+# flag the programs that cannot keep up, not to replace the logger's own measured ProcessTime.
+
+import re
+from collections import namedtuple
+
+from crbasic.program import UNITS, Program, parse_statement
+from crbasic.storage import DEFAULT_STRING, string_sizes
+
+# Seconds spent in a generic processing statement (assignment, math, string function) on the CR1000X
+STATEMENT_SECONDS = 20e-6
+# Processing speed of each logger relative to the CR1000X
+PROCESS_SPEED = {"CR1000X": 1.0, "CR3XX": 0.5, "CR1000": 0.7}
+# Fixed costs of instructions that do not depend on their arguments, in seconds
+MEASURE_SECONDS = {"battery": 1e-3, "pulsecount": 0.1e-3, "sw12": 0.1e-3}
+PROCESS_SECONDS = {"serialopen": 2e-3, "serialclose": 1e-3, "serialflush": 0.1e-3, "serialinblock": 0.5e-3,
+                   "serialinrecord": 0.5e-3, "calltable": 1e-3, "satvp": 50e-6,
+                   "dewpoint": 50e-6, "wetdrybulb": 50e-6, "exitfor": 0.0}
+# SplitStr: a fixed cost per call, plus the time to search each byte of the string it splits (by its
+# declared As String size) and to store each value it splits out. A 400 byte message costs about 0.5 ms.
+SPLITSTR_SECONDS = 0.1e-3
+SPLITSTR_BYTE_SECONDS = 1e-6
+SPLITSTR_VALUE_SECONDS = 10e-6
+# Settling time used when an analog instruction's SettlingTime argument is 0
+DEFAULT_SETTLING = 450e-6
+# SDI-12 sensors report the time a measurement takes in their M! response; most of the generator's
+# sensors need about a second. SDI12_OVERHEAD covers the break, command and D0! data transfer. A
+# concurrent (C!) measurement does not wait: the logger collects the result started on the previous scan,
+# so it only costs the overhead.
+SDI12_MEASURE_SECONDS = 1.0
+SDI12_OVERHEAD = 0.1
+
+# A scan's estimate in seconds. saved is the SDI-12 measurement time its concurrent measurements do not
+# wait for and average the process time per scan over many scans (None when it is not estimated).
+ScanEstimate = namedtuple("ScanEstimate", "name interval measure process saved average", defaults=(0.0, None))
+
+_THEN = re.compile(r"\bthen\b", re.IGNORECASE)
+_FOR = re.compile(r"=\s*([0-9.]+)\s+to\s+([0-9.]+)", re.IGNORECASE)
+_INTERVAL = re.compile(r"\btimeintointerval\s*\(\s*[0-9.]+\s*,\s*([0-9.]+)\s*,\s*([a-z]+)\s*\)", re.IGNORECASE)
+
+
+# Raised when a program's scans do not fit their intervals and the caller asked to refuse such programs
+class ScanBudgetError(ValueError):
+    pass
+
+
+def _seconds(arg, default=0.0):
+    try:
+        return float(arg)
+    except ValueError:
+        return default
+
+
+# Integration time of an analog measurement: _60Hz/_50Hz (or 60/50 on the CR300) reject that mains
+# frequency by integrating over one cycle, larger numbers are microseconds
+def _integration(arg):
+    value = _seconds(arg.lstrip("_").lower().replace("hz", ""), 250.0)
+    return 1.0 / value if 0 < value < 100 else value * 1e-6
+
+
+# Share of the scans of a scan interval in which an If on TimeIntoInterval is true, or None when the If does
+# not test TimeIntoInterval. Conditions ORed with it (a first scan flag) are taken to be true only rarely.
+def _share(code, interval):
+    match = _INTERVAL.search(code)
+    if match is None or match.group(2).lower() not in UNITS:
+        return None
+    period = float(match.group(1)) * UNITS[match.group(2).lower()]
+    return min(1.0, interval / period) if period > 0 else None
+
+
+def _true(arg):
+    return arg.strip().lower() in ("true", "1", "-1")
+
+
+# Whether an SDI12Recorder statement starts a concurrent measurement
+def _concurrent(statement):
+    return len(statement.args) > 3 and statement.args[3].strip('" ').upper().startswith("C")
+
+
+# Seconds of SDI-12 measurement time the concurrent measurements of the statements (and of the
+# subroutines they call) save
+def _saved(statements, subroutines, seen=()):
+    saved = 0.0
+    for statement in statements:
+        if statement.instruction == "sdi12recorder" and _concurrent(statement):
+            saved += SDI12_MEASURE_SECONDS
+        elif statement.instruction == "call" and statement.args and statement.args[0].lower() not in seen:
+            name = statement.args[0].lower()
+            saved += _saved(subroutines.get(name, []), subroutines, seen + (name,))
+    return saved
+
+
+# (measure, process) seconds of a single statement. strings holds the declared sizes of the program's
+# String variables (see storage.string_sizes). With the scan interval, blocks on TimeIntoInterval are priced
+# by their share of the scans (see _block_cost).
+def _statement_cost(statement, subroutines, logger, strings, interval=None):
+    instruction = statement.instruction
+    args = statement.args
+    if instruction in MEASURE_SECONDS:
+        return MEASURE_SECONDS[instruction], 0.0
+    if instruction in PROCESS_SECONDS:
+        return 0.0, PROCESS_SECONDS[instruction] / PROCESS_SPEED.get(logger, 1.0)
+    if instruction == "splitstr" and len(args) > 3:
+        searched = strings.get(args[1].partition("(")[0].strip().lower(), DEFAULT_STRING)
+        seconds = SPLITSTR_SECONDS + searched * SPLITSTR_BYTE_SECONDS + _seconds(args[3], 1.0) * SPLITSTR_VALUE_SECONDS
+        return 0.0, seconds / PROCESS_SPEED.get(logger, 1.0)
+    if instruction in ("voltse", "voltdiff", "brhalf") or instruction.startswith("therm"):
+        # Position of (SettlingTime, Integ) and of the argument that doubles the measurement
+        settle, double = {"voltse": (5, 4), "voltdiff": (5, 4), "brhalf": (8, 7)}.get(instruction, (4, None))
+        if len(args) <= settle + 1:
+            return 0.0, 0.0
+        settling = _seconds(args[settle]) * 1e-6 or DEFAULT_SETTLING
+        cost = _seconds(args[1], 1.0) * (settling + _integration(args[settle + 1]))
+        return cost * (2 if double is not None and _true(args[double]) else 1), 0.0
+    if instruction == "pulseport" and len(args) > 1:
+        return _seconds(args[1]) * 1e-6, 0.0
+    if instruction == "sdi12recorder":
+        return SDI12_OVERHEAD + (0.0 if _concurrent(statement) else SDI12_MEASURE_SECONDS), 0.0
+    if instruction == "serialin" and len(args) > 2:
+        # Waits up to TimeOut hundredths of a second for its termination character
+        return 0.0, _seconds(args[2]) * 0.01
+    if instruction == "serialout" and len(args) > 4:
+        # Only waits (up to TimeOut hundredths of a second per try) when it waits for a reply
+        if args[2].strip() in ('""', "0"):
+            return 0.0, 2e-3
+        return 0.0, _seconds(args[4]) * 0.01 * max(1.0, _seconds(args[3], 1.0))
+    if instruction == "delay" and len(args) > 2:
+        seconds = _seconds(args[1]) * {"usec": 1e-6, "msec": 1e-3, "sec": 1.0, "min": 60.0}.get(args[2].lower(), 1.0)
+        return (seconds, 0.0) if args[0].strip() == "1" else (0.0, seconds)
+    if instruction == "call" and args:
+        return _block_cost(subroutines.get(args[0].lower(), []), 0, subroutines, logger, strings, interval)[:2]
+    return 0.0, STATEMENT_SECONDS / PROCESS_SPEED.get(logger, 1.0)
+
+
+# Worst case (measure, process, next index) of the statements from index up to the Next/Else/ElseIf/EndIf
+# or Case/EndSelect that ends the block. Given the scan interval, an If on TimeIntoInterval costs its
+# first branch in its share of the scans and its most expensive other branch in the rest instead, which
+# averages the cost over many scans.
+def _block_cost(statements, index, subroutines, logger, strings, interval=None):
+    measure = process = 0.0
+    while index < len(statements):
+        statement = statements[index]
+        instruction = statement.instruction
+        if instruction in ("next", "else", "elseif", "endif", "case", "endselect"):
+            break
+        if instruction == "for":
+            match = _FOR.search(statement.code)
+            count = float(match.group(2)) - float(match.group(1)) + 1 if match else 1.0
+            body_measure, body_process, index = _block_cost(statements, index + 1, subroutines, logger, strings,
+                                                            interval)
+            measure += body_measure * count
+            process += body_process * count
+        elif instruction in ("if", "select"):
+            then = _THEN.search(statement.code) if instruction == "if" else None
+            inline = statement.code[then.end():].strip() if then else ""
+            end = "endif" if instruction == "if" else "endselect"
+            share = _share(statement.code, interval) if instruction == "if" and interval else None
+            process += STATEMENT_SECONDS / PROCESS_SPEED.get(logger, 1.0)
+            if inline:
+                cost = _statement_cost(parse_statement(statement.number, inline), subroutines, logger, strings,
+                                       interval)
+                measure += cost[0] * (1.0 if share is None else share)
+                process += cost[1] * (1.0 if share is None else share)
+            else:
+                branches = []
+                while index < len(statements) and statements[index].instruction != end:
+                    branch_measure, branch_process, index = _block_cost(statements, index + 1, subroutines,
+                                                                        logger, strings, interval)
+                    branches.append((branch_measure, branch_process))
+                if share is None:
+                    worst = max(branches, key=sum, default=(0.0, 0.0))
+                    measure += worst[0]
+                    process += worst[1]
+                else:
+                    other = max(branches[1:], key=sum, default=(0.0, 0.0))
+                    measure += share * branches[0][0] + (1.0 - share) * other[0]
+                    process += share * branches[0][1] + (1.0 - share) * other[1]
+        else:
+            cost = _statement_cost(statement, subroutines, logger, strings, interval)
+            measure += cost[0]
+            process += cost[1]
+        index += 1
+    return measure, process, index
+
+
+# (measure, process) seconds of a list of statements that may call the given subroutines. strings maps
+# the String variables they use to their declared sizes (DEFAULT_STRING when left out).
+def estimate_statements(statements, subroutines, logger="CR1000X", strings=None):
+    return _block_cost(statements, 0, subroutines, logger, strings or {})[:2]
+
+
+# Returns a ScanEstimate for the main scan and every slow sequence of the program text
+def estimate_scans(text, logger="CR1000X"):
+    program = text if isinstance(text, Program) else Program(text)
+    strings = string_sizes(program.statements)
+    estimates = []
+    for scan in program.scans:
+        measure, process, _ = _block_cost(scan.statements, 0, program.subroutines, logger, strings)
+        average = _block_cost(scan.statements, 0, program.subroutines, logger, strings, scan.interval)[1]
+        estimates.append(ScanEstimate(scan.name, scan.interval, measure, process,
+                                      _saved(scan.statements, program.subroutines), average))
+    return estimates
+
+
+# Estimates that do not fit in their scan interval
+def over_budget(estimates):
+    return [estimate for estimate in estimates if estimate.measure + estimate.process > estimate.interval]
+
+
+# One warning line per scan that does not fit
+def budget_warnings(estimates):
+    return ["{0} needs an estimated {1:.3f} s of its {2:g} s interval".format(
+        estimate.name, estimate.measure + estimate.process, estimate.interval) for estimate in over_budget(estimates)]
+
+
+# Estimates the program's scans and raises ScanBudgetError if refuse is set and one does not fit.
+# Returns the estimates.
+def check_scans(text, logger="CR1000X", refuse=False):
+    estimates = estimate_scans(text, logger)
+    warnings = budget_warnings(estimates)
+    if refuse and warnings:
+        raise ScanBudgetError("; ".join(warnings))
+    return estimates
+
+
+# Text table of the estimates
+def format_estimates(estimates):
+    rows = ["{0:<16} {1:>10} {2:>10} {3:>10} {4:>10} {5:>6}".format(
+        "Scan", "Interval", "Measure", "Process", "Total", "Use")]
+    for estimate in estimates:
+        total = estimate.measure + estimate.process
+        rows.append("{0:<16} {1:>8g} s {2:>8.3f} s {3:>8.3f} s {4:>8.3f} s {5:>5.0f}%{6}".format(
+            estimate.name, estimate.interval, estimate.measure, estimate.process, total,
+            total * 100 / estimate.interval, "  OVER" if total > estimate.interval else ""))
+    for estimate in estimates:
+        if estimate.average is not None and estimate.average < estimate.process - 0.5e-3:
+            rows.append("{0}: work on an output interval averages {1:.4f} s of process time per scan".format(
+                estimate.name, estimate.average))
+        if estimate.saved:
+            rows.append("{0}: concurrent SDI-12 measurements save an estimated {1:.3f} s per scan".format(
+                estimate.name, estimate.saved))
+    return "\n".join(rows) + "\n"
@@ -0,0 +1,96 @@
+# scheduler.py
+# Scan scheduler used when a station's "schedule" option is "auto". The catalog puts every instrument's
+# slow work (serial polls, SDI-12 measurements, their Delays) in a fixed slow sequence, so the blocking
+# waits of all the instruments in one sequence add up and the sequence skips scans. The scheduler instead
+# takes each piece of work (a task: one instrument's lines, the rate it must run at and its estimated
+# cost from scantime) and packs the tasks into as many SlowSequence scans as needed so that no sequence
+# holds more than one blocking task or more than LOAD_SHARE of its interval. Slow work the catalog marks
+# as movable (a main scan section with a "rate") is taken out of the main scan so the main scan keeps its
+# 1 second interval.
+#
+# Tasks that talk on the same port stay in one sequence (in catalog order) so two sequences never use a
+# port at once. CRBasic has no scan offset, so sequences of the same rate are only separated by being
+# independent tasks on the logger.
+
+import re
+from collections import namedtuple
+
+from crbasic.program import UNITS
+
+# Share of a sequence's interval the scheduler fills
+LOAD_SHARE = 0.5
+# A task that takes more than this many seconds blocks its sequence (an SDI-12 M! measurement or a serial
+# wait; a concurrent C! measurement only costs its data transfer)
+BLOCKING_SECONDS = 0.15
+
+# One unit of slow work: its place in catalog order, the rate it runs at in seconds, its estimated cost
+# in seconds, the ports it uses and its lines. A fallback task only fills a sequence others already use.
+Task = namedtuple("Task", "order rate cost ports lines fallback")
+# One scheduled SlowSequence: its interval in seconds and its tasks in catalog order
+Sequence = namedtuple("Sequence", "rate tasks")
+
+_PORT = re.compile(r"(\d+)$")
+# Instructions that use a port and the position of the port argument
+_PORT_ARGS = {"sdi12recorder": 1, "serialin": 1, "serialopen": 0, "serialout": 0, "serialinblock": 0,
+              "serialinrecord": 0, "serialclose": 0, "serialflush": 0}
+
+
+# Returns the set of control ports (C1, C3, ...) the statements and the subroutines they call use. ComC5,
+# ComSDC7 and C7 name a port by its terminal number, which is what two tasks must not share.
+def ports(statements, subroutines, seen=None):
+    seen = set() if seen is None else seen
+    used = set()
+    for statement in statements:
+        instruction = statement.instruction
+        if instruction in _PORT_ARGS and len(statement.args) > _PORT_ARGS[instruction]:
+            match = _PORT.search(statement.args[_PORT_ARGS[instruction]])
+            if match:
+                used.add("C" + match.group(1))
+        elif instruction == "call" and statement.args and statement.args[0].lower() not in seen:
+            name = statement.args[0].lower()
+            seen.add(name)
+            used |= ports(subroutines.get(name, []), subroutines, seen)
+    return used
+
+
+# Merges the tasks of one rate that share a port into a single task
+def _merge_ports(tasks):
+    merged = []
+    for task in tasks:
+        shared = [other for other in merged if other.ports & task.ports]
+        for other in shared:
+            merged.remove(other)
+        group = sorted(shared + [task], key=lambda item: item.order)
+        merged.append(Task(group[0].order, task.rate, sum(item.cost for item in group),
+                           frozenset().union(*(item.ports for item in group)),
+                           [line for item in group for line in item.lines], False))
+    return merged
+
+
+# Packs tasks into SlowSequences and returns them ordered by rate, then catalog order
+def schedule(tasks):
+    sequences = []
+    for rate in sorted({task.rate for task in tasks if not task.fallback}):
+        bins = []
+        work = _merge_ports([task for task in tasks if task.rate == rate and not task.fallback])
+        for task in sorted(work, key=lambda item: (-item.cost, item.order)):
+            blocking = task.cost > BLOCKING_SECONDS
+            for held in bins:
+                load = sum(item.cost for item in held)
+                if load + task.cost <= LOAD_SHARE * rate and not (
+                        blocking and any(item.cost > BLOCKING_SECONDS for item in held)):
+                    held.append(task)
+                    break
+            else:
+                bins.append([task])
+        bins.sort(key=lambda held: min(item.order for item in held))
+        bins[0].extend(task for task in tasks if task.rate == rate and task.fallback)
+        sequences.extend(Sequence(rate, sorted(held, key=lambda item: item.order)) for held in bins)
+    return sequences
+
+
+# The Scan statement of a sequence
+def scan_statement(rate):
+    if rate >= UNITS["min"] and rate % UNITS["min"] == 0:
+        return "Scan ({0:g},Min,0,0)".format(rate / UNITS["min"])
+    return "Scan ({0:g},Sec,0,0)".format(rate)
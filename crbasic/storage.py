@@ -0,0 +1,255 @@
+# storage.py
+# Final storage plan of a generated program: the bytes a record of every DataTable takes, the records
+# the table is given and how many days of data that holds at its DataInterval. A record's width is the sum
+# of its output instructions' values (Sample, Average, Maximum with the time of the maximum, WindVector
+# by its output option, ...) in their data type, String fields taking their variable's As String *N size,
+# plus RECORD_OVERHEAD. A table sized -1 is auto-allocated: the logger shares the final storage the fixed
+# size tables leave between the -1 tables so they all fill at the same time.
+#
+# The final storage figures are planning numbers for the loggers' standard memory, not the exact space
+# free once the operating system and program are loaded; the logger's Status table reports that.
+
+import math
+import re
+from collections import namedtuple
+
+from crbasic.program import UNITS, Program, split_args
+
+# Final storage in bytes each logger's data tables share
+FINAL_STORAGE = {"CR1000X": 4 * 2 ** 20, "CR1000": 2 * 2 ** 20, "CR3XX": 2 * 2 ** 20}
+# Bytes of final storage a record needs besides its fields (time stamp and record number)
+RECORD_OVERHEAD = 12
+# Bytes per value of each output data type
+TYPE_BYTES = {"fp2": 2, "ieee4": 4, "ieee8": 8, "uint1": 1, "uint2": 2, "uint4": 4, "int4": 4, "long": 4,
+              "boolean": 4, "bool8": 1, "nsec": 8}
+# Size of a String variable declared without *N
+DEFAULT_STRING = 24
+# Values WindVector outputs per repetition for each output option
+WIND_VECTOR_VALUES = {"0": 3, "1": 2, "2": 4, "3": 1, "4": 2}
+# Share of final storage the table size pass may fill
+STORAGE_SHARE = 0.9
+
+# One DataTable: its size argument (-1 for auto-allocated), DataInterval in seconds (None without one),
+# bytes per record, the records it holds, their bytes, the days of data they cover (None for tables
+# without an interval) and whether it is collected (False for the tables the program only reads back)
+TablePlan = namedtuple("TablePlan", "name size interval record_bytes records bytes days collected",
+                       defaults=(True,))
+
+# Raised when a program's fixed size tables leave an auto-allocated table no records
+class StorageError(ValueError):
+    pass
+
+
+_DECLARED = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*(?:\(([^)]*)\))?\s*(?:as\s+([A-Za-z0-9]+)\s*(?:\*\s*(\d+))?)?",
+                       re.IGNORECASE)
+_STRING = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)(?:\s*\(.*?\))?\s+as\s+string\s*(?:\*\s*(\d+))?", re.IGNORECASE)
+_OUTPUT_TABLES = re.compile(r"^'Output Data Tables:(.*)$", re.MULTILINE)
+_TABLE_READ = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\.[A-Za-z_]")
+
+
+# Sizes of the program's String variables by lower case name
+def string_sizes(statements):
+    sizes = {}
+    for statement in statements:
+        if statement.instruction in ("public", "dim"):
+            for item in split_args(statement.code[len(statement.instruction):]):
+                match = _STRING.match(item.strip())
+                if match:
+                    sizes[match.group(1).lower()] = int(match.group(2) or DEFAULT_STRING)
+    return sizes
+
+
+# Bytes one output instruction adds to a record
+def _field_bytes(statement, strings):
+    args = statement.args
+    if len(args) < 3:
+        return 0
+    try:
+        reps = int(args[0])
+    except ValueError:
+        reps = 1
+    instruction = statement.instruction
+    if instruction == "windvector":
+        kind = args[3] if len(args) > 3 else "fp2"
+        values = WIND_VECTOR_VALUES.get(args[7] if len(args) > 7 else "0", 3)
+    else:
+        kind = args[2]
+        values = 1
+    if kind.lower() == "string":
+        width = strings.get(args[1].partition("(")[0].strip().lower(), DEFAULT_STRING)
+    else:
+        width = TYPE_BYTES.get(kind.lower(), 4)
+    size = reps * values * width
+    if instruction in ("maximum", "minimum") and len(args) > 4 and args[4].lower() == "true":
+        size += reps * TYPE_BYTES["nsec"]
+    return size
+
+
+# The DataTables of a program: for each, its name, size argument, interval in seconds, record bytes and
+# the number of its DataTable line
+def _tables(program):
+    strings = string_sizes(program.statements)
+    tables = []
+    table = None
+    for statement in program.statements:
+        instruction = statement.instruction
+        if instruction == "datatable" and len(statement.args) > 2:
+            table = [statement.args[0], int(statement.args[2]), None, RECORD_OVERHEAD, statement.number]
+        elif table is None:
+            continue
+        elif instruction == "datainterval" and len(statement.args) > 2:
+            unit = UNITS.get(statement.args[2].lower())
+            if unit is not None:
+                table[2] = float(statement.args[1]) * unit
+        elif instruction == "endtable":
+            tables.append(table)
+            table = None
+        elif instruction not in ("openinterval", "cardout", "tablefile", "fillstop"):
+            table[3] += _field_bytes(statement, strings)
+    return tables
+
+
+# Names (lower case) of the tables the program only reads back (TwoMinute.Wind_Speed_mph_WVc) and does
+# not list as output data tables
+def _helpers(text, program, tables):
+    listed = _OUTPUT_TABLES.search(text)
+    if listed is None:
+        return set()
+    output = {name.strip().lower() for name in listed.group(1).split(",")}
+    read = set()
+    for statement in program.statements:
+        if statement.instruction not in ("public", "dim", "alias", "units"):
+            read.update(name.lower() for name in _TABLE_READ.findall(statement.code))
+    return {name.lower() for name, *_ in tables if name.lower() in read and name.lower() not in output}
+
+
+# TablePlans of the tables on the logger, helpers naming the tables that are not collected
+def _plan(tables, logger, helpers):
+    fixed = sum(size * record for _, size, _, record, _ in tables if size > 0)
+    left = max(0, FINAL_STORAGE[logger] - fixed)
+    auto = [(interval, record) for _, size, interval, record, _ in tables if size <= 0]
+    per_day = sum(record * 86400 / interval for interval, record in auto if interval)
+    plans = []
+    for name, size, interval, record, _ in tables:
+        if size > 0:
+            records = size
+        elif interval and per_day:
+            records = int(left / per_day * 86400 / interval)
+        else:
+            records = left // (len(auto) * record)
+        days = records * interval / 86400 if interval else None
+        plans.append(TablePlan(name, size, interval, record, records, records * record, days,
+                               name.lower() not in helpers))
+    return plans
+
+
+# Returns a TablePlan for every DataTable of the program text
+def plan_tables(text, logger="CR1000X"):
+    program = Program(text)
+    tables = _tables(program)
+    return _plan(tables, logger, _helpers(text, program, tables))
+
+
+# Bytes of one record of the Public table, the values a client gets each time it polls the logger: 4 per
+# Float, Long or Boolean value and the declared size of each String, counting every array element
+def public_bytes(text):
+    size = 0
+    for statement in Program(text).statements:
+        if statement.instruction != "public":
+            continue
+        for item in split_args(statement.code[len("public"):]):
+            match = _DECLARED.match(item.strip())
+            if match is None:
+                continue
+            count = 1
+            for dimension in (match.group(2) or "").split(","):
+                count *= int(dimension) if dimension.strip().isdigit() else 1
+            if (match.group(3) or "").lower() == "string":
+                size += count * int(match.group(4) or DEFAULT_STRING)
+            else:
+                size += count * 4
+    return size
+
+
+# Total bytes of the fixed size tables of a plan
+def fixed_bytes(plans):
+    return sum(plan.bytes for plan in plans if plan.size > 0)
+
+
+# One warning line if the fixed size tables do not fit the logger's final storage
+def storage_warnings(plans, logger="CR1000X"):
+    if fixed_bytes(plans) <= FINAL_STORAGE[logger]:
+        return []
+    return ["data tables need {0:.0f} kB of the {1:.0f} kB of final storage".format(
+        fixed_bytes(plans) / 1024, FINAL_STORAGE[logger] / 1024)]
+
+
+# Bytes of final storage the tables of a plan may fill besides its fixed size tables, keeping
+# retention_days of records of its auto-allocated tables with an interval, within STORAGE_SHARE of the
+# logger's final storage
+def free_bytes(plans, logger, retention_days):
+    budget = STORAGE_SHARE * FINAL_STORAGE[logger] - fixed_bytes(plans)
+    for plan in plans:
+        if plan.size <= 0 and plan.interval:
+            budget -= retention_days * 86400 / plan.interval * plan.record_bytes
+    return budget
+
+
+# Raises StorageError if the program's fixed size tables leave one of its auto-allocated tables no records
+def check_tables(text, logger="CR1000X"):
+    empty = [plan.name for plan in plan_tables(text, logger) if plan.size <= 0 and plan.records < 1]
+    if empty:
+        raise StorageError("the fixed size tables leave no final storage for " + ", ".join(empty))
+
+
+# Table size pass. Gives every output table with a fixed size and an interval the records for
+# retention_days of data (the station's) and the tables the program only reads back one record.
+# Auto-allocated output tables stay auto-allocated and get the rest; if the fixed tables would leave them
+# less than retention_days or fill more than STORAGE_SHARE of final storage, the fixed tables are shrunk in
+# proportion. Fixed size tables without an interval (the event tables) keep their size and count against
+# that share. Raises StorageError if an auto-allocated table would still get no records.
+def size_tables(body, logger, retention_days):
+    program = Program(body)
+    tables = _tables(program)
+    if not tables:
+        return body
+    helpers = _helpers(body, program, tables)
+    sizes = {}
+    for name, size, interval, record, _ in tables:
+        if name.lower() in helpers:
+            sizes[name] = 1
+        elif size > 0 and interval:
+            sizes[name] = math.ceil(retention_days * 86400 / interval)
+    budget = STORAGE_SHARE * FINAL_STORAGE[logger]
+    for name, size, interval, record, _ in tables:
+        if sizes.get(name) == 1:
+            budget -= record
+        elif name not in sizes and size <= 0 and interval:
+            budget -= retention_days * 86400 / interval * record
+        elif name not in sizes and size > 0:
+            budget -= size * record
+    sized = sum(sizes[name] * record for name, _, _, record, _ in tables if sizes.get(name, 1) > 1)
+    if sized > budget:
+        scale = max(0.0, budget) / sized
+        sizes.update({name: max(1, int(sizes[name] * scale)) for name in sizes if sizes[name] > 1})
+    lines = program.lines
+    for name, size, _, _, number in tables:
+        if name in sizes and sizes[name] != size:
+            lines[number] = lines[number].replace(",{0})".format(size), ",{0})".format(sizes[name]), 1)
+    text = "\n".join(lines)
+    check_tables(text, logger)
+    return text
+
+
+# Text table of a storage plan
+def format_plan(plans, logger="CR1000X"):
+    rows = ["{0:<16} {1:>10} {2:>8} {3:>9} {4:>10} {5:>8}".format(
+        "Table", "Interval", "Record", "Records", "Storage", "Days")]
+    for plan in plans:
+        rows.append("{0:<16} {1:>8} {2:>6} B {3:>9} {4:>7.0f} kB {5:>8}{6}".format(
+            plan.name, "{0:g} s".format(plan.interval) if plan.interval else "-", plan.record_bytes, plan.records,
+            plan.bytes / 1024, "{0:.1f}".format(plan.days) if plan.days is not None else "-",
+            "  (auto)" if plan.size <= 0 else ""))
+    rows.append("{0} kB of {1:.0f} kB final storage in fixed size tables".format(
+        round(fixed_bytes(plans) / 1024), FINAL_STORAGE[logger] / 1024))
+    return "\n".join(rows) + "\n"
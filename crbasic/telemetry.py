@@ -0,0 +1,200 @@
+# telemetry.py
+# What a station sends over its cellular or radio link and the output type pass that makes it smaller.
+# Every collected table sends its records (storage.py works out their bytes), so a station's daily volume
+# is the sum of record bytes times records per day, and a poll every POLL_SECONDS brings in that share of
+# it on average.
+#
+# The catalog writes nearly every field as FP2 or a String. FIELDS gives the range and resolution some
+# fields need; the output type pass (the "field_types" option's "narrow") writes each of them in the
+# smallest data type the logger supports that holds that range at that resolution. Unsigned types store
+# NAN as their largest value, so a field's range has to stay below it. String fields that only spell out a
+# code the same table already samples (CODED) are dropped.
+#
+# Status fields (Strings, alarm flags and state codes) rarely change, yet the 10 minute tables repeat them
+# in every record. The event table pass (the "status_tables" option's "change") moves them out of the
+# EVENT_TABLES into a table of their own that only gets a record when one of them changes.
+
+from collections import namedtuple
+
+from crbasic.program import Program
+from crbasic.storage import DEFAULT_STRING, TYPE_BYTES, check_tables, plan_tables, string_sizes
+
+# Seconds between polls of a station
+POLL_SECONDS = 600
+# Range (lowest, highest) and resolution each field (lower case) needs
+FIELDS = {"two_min_wind_dir_deg": (0, 360, 1), "synopcode": (0, 99, 1), "dscsurfstatus": (0, 209, 1)}
+FIELDS.update(dict.fromkeys(("emitter_failure", "emitter_lens_dirty", "emitter_temp_error", "detector_lens_dirty",
+                             "detector_temp_error", "detector_saturated", "particle_limit_error", "ext_temp_error",
+                             "hood_temp_error", "flash_read_error", "flash_write_error", "signature_error"),
+                            (0, 1, 1)))
+# String fields and the code field that holds the same information
+CODED = {"dscroadstatus": "dscsurfstatus"}
+# Output data types each logger can narrow a field to
+OUTPUT_TYPES = {"CR1000X": ("uint1", "fp2", "uint2", "ieee4"), "CR1000": ("fp2", "uint2", "ieee4"),
+                "CR3XX": ("fp2", "uint2", "ieee4")}
+# Largest value of the unsigned types (also their NAN)
+UNSIGNED_MAX = {"uint1": 255, "uint2": 65535}
+# Tables whose status fields the event table pass moves, the numeric fields (lower case) that are status
+# fields besides Strings, and the size of the status event tables
+EVENT_TABLES = ("MesoAtmo", "MesoRoad", "PresentWx")
+STATUS_FIELDS = {field for field, (low, high, _) in FIELDS.items() if (low, high) == (0, 1)}
+STATUS_FIELDS.update(("synopcode", "sysstatus", "dscsurfstatus", "dsthardwarestatus", "dschardwarestatus",
+                      "ice_avgfriccode", "ice_curfriccode"))
+EVENT_TABLE_SIZE = 1008
+# Records per day an event table is counted with in bandwidth figures (status changes are not known ahead)
+EVENT_RECORDS_PER_DAY = 24
+# Characters a number takes in a status change key, and the fields joined into the key per line
+NUMBER_WIDTH = 12
+KEY_FIELDS = 4
+
+# Bytes a station sends per poll on average and per day
+Bandwidth = namedtuple("Bandwidth", "per_poll per_day")
+
+_OUTPUT = ("sample", "average", "maximum", "minimum", "totalize")
+
+
+# Finest step an FP2 value of the given magnitude keeps (FP2 has 4 digits and at most 7999)
+def _fp2_step(magnitude):
+    for limit, step in ((8, 0.001), (80, 0.01), (800, 0.1), (8000, 1)):
+        if magnitude < limit:
+            return step
+    return None
+
+
+# Whether an output data type holds every value from low to high at the resolution
+def _fits(kind, low, high, resolution):
+    if kind == "ieee4":
+        return True
+    if kind == "fp2":
+        step = _fp2_step(max(abs(low), abs(high)))
+        return step is not None and step <= resolution
+    return low >= 0 and high < UNSIGNED_MAX[kind] and resolution >= 1 and float(resolution).is_integer()
+
+
+# Smallest output data type of the logger that meets a field's range and resolution
+def narrowest(field, logger="CR1000X"):
+    low, high, resolution = FIELDS[field.lower()]
+    return min((kind for kind in OUTPUT_TYPES[logger] if _fits(kind, low, high, resolution)),
+               key=lambda kind: TYPE_BYTES[kind])
+
+
+# Output type pass. Writes every table field listed in FIELDS in its narrowest type when that is smaller
+# than the type it has, and drops the CODED String fields whose code is sampled in the same table.
+def narrow_fields(body, logger):
+    program = Program(body)
+    lines = program.lines
+    drop = set()
+    table = None
+    for statement in program.statements:
+        instruction = statement.instruction
+        if instruction == "datatable":
+            table = []
+        elif instruction == "endtable" and table is not None:
+            sampled = {output.args[1].lower() for output in table}
+            drop.update(output.number for output in table
+                        if CODED.get(output.args[1].lower()) in sampled and output.args[2].lower() == "string")
+            table = None
+        elif table is not None and instruction in _OUTPUT and len(statement.args) > 2:
+            table.append(statement)
+            field, kind = statement.args[1], statement.args[2]
+            if field.lower() not in FIELDS or kind.lower() not in TYPE_BYTES:
+                continue
+            narrow = narrowest(field, logger)
+            if TYPE_BYTES[narrow] < TYPE_BYTES[kind.lower()]:
+                lines[statement.number] = lines[statement.number].replace(
+                    "{0},{1}".format(field, kind), "{0},{1}".format(field, narrow.upper()), 1)
+    return "\n".join(line for number, line in enumerate(lines) if number not in drop)
+
+
+# Event table pass. For each of the EVENT_TABLES with status fields, moves their output instructions into
+# a <table>Events table without a DataInterval whose trigger is set when the fields' values, joined into a
+# key string, differ from the last scan's. The table is called right after its 10 minute table. Raises
+# storage.StorageError if the event tables leave an auto-allocated table no records.
+def event_tables(body, logger):
+    program = Program(body)
+    lines = program.lines
+    strings = string_sizes(program.statements)
+    names = {name.lower() for name in EVENT_TABLES}
+    moved = {}
+    ends = {}
+    table = None
+    for statement in program.statements:
+        instruction = statement.instruction
+        if instruction == "datatable" and statement.args[0].lower() in names:
+            table = statement.args[0]
+        elif instruction == "endtable" and table is not None:
+            ends[table] = statement.number
+            table = None
+        elif table is not None and instruction in _OUTPUT and len(statement.args) > 2 and (
+                statement.args[2].lower() == "string" or statement.args[1].lower() in STATUS_FIELDS):
+            moved.setdefault(table, []).append(statement)
+    if not moved:
+        return body
+
+    insert = {}
+    declarations = []
+    drop = set()
+    for table, outputs in moved.items():
+        end = ends[table]
+        events = table + "Events"
+        fields = [output.args[1] for output in outputs]
+        width = sum(strings.get(field.lower(), NUMBER_WIDTH if output.args[2].lower() != "string" else DEFAULT_STRING)
+                    for field, output in zip(fields, outputs)) + len(fields)
+        declarations.append("Dim {0}Key As String * {1}, {0}Last As String * {1}, {0}Change As Boolean".format(
+            table, width))
+        drop.update(output.number for output in outputs)
+        insert[end] = ["", "'{0} table (a record whenever a status field changes)".format(events),
+                       "DataTable ({0},{1}Change,{2})".format(events, table, EVENT_TABLE_SIZE)]
+        insert[end] += [lines[output.number] for output in outputs] + ["EndTable"]
+        for statement in program.statements:
+            if statement.instruction == "calltable" and statement.args[0].lower() == table.lower():
+                indent = lines[statement.number][:len(lines[statement.number]) - len(lines[statement.number].lstrip())]
+                key = ["{0}Key = {1}".format(table, ' & "," & '.join(fields[:KEY_FIELDS]))]
+                key += ['{0}Key = {0}Key & "," & {1}'.format(table, ' & "," & '.join(fields[n:n + KEY_FIELDS]))
+                        for n in range(KEY_FIELDS, len(fields), KEY_FIELDS)]
+                insert[statement.number] = [indent + line for line in key + [
+                    "{0}Change = ({0}Key <> {0}Last)".format(table),
+                    "{0}Last = {0}Key".format(table),
+                    "CallTable " + events]]
+    first_table = min(statement.number for statement in program.statements if statement.instruction == "datatable")
+    last_declaration = max(statement.number for statement in program.statements
+                           if statement.instruction in ("public", "dim", "alias") and statement.number < first_table)
+    insert[last_declaration] = declarations + insert.get(last_declaration, [])
+
+    out = []
+    for number, line in enumerate(lines):
+        if line.startswith("'Output Data Tables:"):
+            line = line.rstrip()
+            for table in moved:
+                line = line.replace(" {0},".format(table), " {0}, {0}Events,".format(table), 1)
+                if line.endswith(" " + table):
+                    line += ", {0}Events".format(table)
+        if number not in drop:
+            out.append(line)
+        out.extend(insert.get(number, []))
+    text = "\n".join(out)
+    check_tables(text, logger)
+    return text
+
+
+# Bandwidth of the collected tables of a storage plan; tables without an interval (event tables) are
+# counted with EVENT_RECORDS_PER_DAY
+def bandwidth(plans, poll_seconds=POLL_SECONDS):
+    per_day = sum(plan.record_bytes * (86400 / plan.interval if plan.interval else EVENT_RECORDS_PER_DAY)
+                  for plan in plans if plan.collected)
+    return Bandwidth(per_day * poll_seconds / 86400, per_day)
+
+
+# The program's bandwidth as it is and with its output types narrowed
+def compare_bandwidth(body, logger="CR1000X", poll_seconds=POLL_SECONDS):
+    return (bandwidth(plan_tables(body, logger), poll_seconds),
+            bandwidth(plan_tables(narrow_fields(body, logger), logger), poll_seconds))
+
+
+# One line describing a (current, narrowed) bandwidth pair
+def format_bandwidth(current, narrowed, poll_seconds=POLL_SECONDS):
+    line = "{0:.0f} B per {1:g} min poll, {2:.1f} kB per day".format(current.per_poll, poll_seconds / 60,
+                                                                   current.per_day / 1024)
+    if narrowed.per_day < current.per_day:
+        line += "; {0:.1f} kB per day with narrowed output types".format(narrowed.per_day / 1024)
+    return line
@@ -0,0 +1,315 @@
+# toa5.py
+# Health report of the data collected from the stations. Reads the TOA5 .dat files LoggerNet writes for
+# MesoAtmo, MesoRoad, Daily, PresentWx, SoilMoisture, the Diagnostics table (see diagnostics.py) or any
+# other table. Per station and table it reports how complete the record is and its gaps. From a
+# Diagnostics table it also reports how often the main scan and each slow sequence skipped a scan.
+#
+# A site's history can run to years and gigabytes, so each file is memory mapped and read in CHUNK_BYTES
+# chunks that end on a line break. Only each line's time stamp is decoded (and the skipped scan counts
+# of a Diagnostics table); the other fields are never split. The time step between records is counted, so
+# the table's interval (the most common step) and its gaps are only worked out once every file of the table
+# has been read. One worker process reads each file. The files of a table are then merged in time order,
+# and the step from one file's last record to the next one's first counts like any other.
+#
+# Usage: python -m crbasic.toa5 data/ [more files or folders] [--workers N] [--json report.json]
+
+import argparse
+import csv
+import datetime
+import heapq
+import json
+import operator
+import mmap
+import os
+import re
+import sys
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Bytes of a file parsed at a time
+CHUNK_BYTES = 8 * 2 ** 20
+# Gaps listed per table (the longest)
+LONGEST_GAPS = 5
+# Main scan interval of the generated programs in seconds
+MAIN_SCAN_SECONDS = 1.0
+
+# One file: its station and table, the time stamps (seconds) of its first and last records, the number of
+# records, a Counter of the steps in seconds between consecutive records, the LONGEST_GAPS largest steps
+# as (step, time stamp before it), the steps that went backwards or repeated a time stamp, and for each
+# skipped scan column the (first, last, increase) of its running count
+FileHealth = namedtuple("FileHealth", "path station table first last records steps longest backwards skipped")
+# One table of a station, all its files merged. interval is the most common step (None with a single
+# record), expected the records the time span should hold at that interval, gaps the number of steps
+# longer than the interval, longest the longest gaps as (seconds, time stamp before it), skipped the skipped
+# scans of each scan (main scan, SlowSequence N) and skip_rate the share of the main scan's scans skipped
+TableHealth = namedtuple("TableHealth", "station table files first last records interval expected missing "
+                                        "completeness gaps longest backwards skipped skip_rate")
+
+_SKIPPED = re.compile(r"^(Main|Slow(\d+))_Skipped$")
+_STAMP = re.compile(rb'\n"([^ "]{10}) ([^"]*)"')
+
+
+# Raised for files that are not TOA5 data files
+class TOA5Error(ValueError):
+    pass
+
+
+# Seconds since 0001-01-01 of midnight of a TOA5 date (b"2023-08-15"). days caches them.
+def _day(date, days):
+    seconds = days[date] = datetime.date(int(date[:4]), int(date[5:7]), int(date[8:10])).toordinal() * 86400
+    return seconds
+
+
+# Seconds since midnight of a TOA5 time of day (b"10:00:00", optionally with fractional seconds). times
+# caches them.
+def _time(clock, times):
+    seconds = times[clock] = int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + float(clock[6:])
+    return seconds
+
+
+# Time stamp text of seconds since 0001-01-01
+def format_stamp(seconds):
+    day, rest = divmod(int(seconds), 86400)
+    return "{0} {1:02d}:{2:02d}".format(datetime.date.fromordinal(day).isoformat(), rest // 3600, rest // 60 % 60)
+
+
+# Yields data from offset start (the start of a line) on in chunks of whole lines, each with the line
+# break before it
+def _chunks(data, start):
+    size = len(data)
+    while start < size:
+        end = data.rfind(b"\n", start, start + CHUNK_BYTES) if start + CHUNK_BYTES < size else size
+        if end < start:
+            end = data.find(b"\n", start + CHUNK_BYTES)
+            end = size if end == -1 else end
+        yield data[start - 1:end]
+        start = end + 1
+
+
+# The station, table and field names of a TOA5 file's header, and the offset of its first data line
+def _header(data):
+    lines = []
+    start = 0
+    for _ in range(4):
+        end = data.find(b"\n", start)
+        if end == -1:
+            raise TOA5Error("incomplete TOA5 header")
+        lines.append(data[start:end].decode("latin-1").strip())
+        start = end + 1
+    environment, fields = list(csv.reader(lines[:2]))
+    if len(environment) < 8 or environment[0] != "TOA5":
+        raise TOA5Error("not a TOA5 file")
+    return environment[1], environment[7], fields, start
+
+
+# Reads one TOA5 file and returns its FileHealth
+def analyze_file(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise TOA5Error("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            station, table, fields, start = _header(data)
+            columns = {}
+            for number, field in enumerate(fields):
+                match = _SKIPPED.match(field)
+                if match:
+                    columns[number] = "SlowSequence " + match.group(2) if match.group(2) else "main scan"
+            skipped = {}
+            steps = Counter()
+            longest = []
+            days = {}
+            times = {}
+            first = last = None
+            records = 0
+            for chunk in _chunks(data, start):
+                stamps = [(days.get(date) or _day(date, days)) + (times.get(clock) or _time(clock, times))
+                          for date, clock in _STAMP.findall(chunk)]
+                if not stamps:
+                    continue
+                records += len(stamps)
+                if first is None:
+                    first = stamps[0]
+                else:
+                    stamps.insert(0, last)
+                moves = list(map(operator.sub, stamps[1:], stamps))
+                counts = Counter(moves)
+                steps.update(counts)
+                # Only the steps longer than the chunk's most common one (its interval) are gap candidates
+                usual = max(counts, key=counts.get, default=0)
+                longest = heapq.nlargest(LONGEST_GAPS, longest + [gap for gap in zip(moves, stamps) if gap[0] > usual])
+                last = stamps[-1]
+                if columns:
+                    for line in chunk.split(b"\n"):
+                        if line[:1] == b'"':
+                            values = line.split(b",")
+                            for number, scan in columns.items():
+                                _count(skipped, scan, values[number] if number < len(values) else b"")
+    backwards = sum(count for step, count in steps.items() if step <= 0)
+    steps = Counter({step: count for step, count in steps.items() if step > 0})
+    return FileHealth(path, station, table, first, last, records, steps, [gap for gap in longest if gap[0] > 0],
+                      backwards, {scan: tuple(count) for scan, count in skipped.items()})
+
+
+# Adds a value of a skipped scan column to its [first, last, increase]. The counts run from the start of
+# the program, so a value below the last one means the program restarted and counts from 0 again.
+def _count(skipped, scan, value):
+    try:
+        value = int(float(value))
+    except ValueError:
+        return
+    count = skipped.get(scan)
+    if count is None:
+        skipped[scan] = [value, value, 0]
+    else:
+        count[2] += value - count[1] if value >= count[1] else value
+        count[1] = value
+
+
+# Merges the FileHealths of one station's table into its TableHealth
+def table_health(files):
+    station, table = files[0].station, files[0].table
+    files = sorted((health for health in files if health.records), key=lambda health: health.first)
+    steps = Counter()
+    longest = []
+    skipped = {}
+    backwards = 0
+    previous = None
+    for health in files:
+        steps.update(health.steps)
+        longest.extend(health.longest)
+        backwards += health.backwards
+        if previous is not None:
+            step = round(health.first - previous.last, 3)
+            if step > 0:
+                steps[step] += 1
+                longest.append((step, previous.last))
+            else:
+                backwards += 1
+        for scan, (first, last, increase) in health.skipped.items():
+            if scan in skipped:
+                _count(skipped, scan, first)
+                skipped[scan][1] = last
+                skipped[scan][2] += increase
+            else:
+                skipped[scan] = [first, last, increase]
+        previous = health
+    first = files[0].first if files else None
+    last = files[-1].last if files else None
+    records = sum(health.records for health in files)
+    interval = min(steps, key=lambda step: (-steps[step], step)) if steps else None
+    expected = missing = gaps = None
+    completeness = skip_rate = None
+    if interval:
+        expected = round((last - first) / interval) + 1
+        gaps = sum(count for step, count in steps.items() if step > interval)
+        missing = sum(count * (round(step / interval) - 1) for step, count in steps.items() if step > interval)
+        completeness = (expected - missing) / expected
+        longest = [(step, start) for step, start in sorted(longest, reverse=True) if step > interval][:LONGEST_GAPS]
+    skipped = {scan: skipped[scan][2] for scan in sorted(skipped, key=lambda scan: (scan != "main scan", scan))}
+    if "main scan" in skipped and last > first:
+        skip_rate = skipped["main scan"] / ((last - first) / MAIN_SCAN_SECONDS)
+    return TableHealth(station, table, len(files), first, last, records, interval, expected, missing, completeness,
+                       gaps, longest if interval else [], backwards, skipped, skip_rate)
+
+
+# Worker: reads one file and returns (path, FileHealth or None, error or None)
+def _analyze(path):
+    try:
+        return path, analyze_file(path), None
+    except (OSError, ValueError) as e:
+        return path, None, str(e)
+
+
+# The .dat files of a list of files and folders (searched recursively)
+def find_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in os.walk(path):
+                files.extend(os.path.join(folder, name) for name in sorted(names) if name.lower().endswith(".dat"))
+        else:
+            files.append(path)
+    return files
+
+
+# Reads the files over the given number of worker processes (default: CPU count, 1 reads them inline)
+# and returns the TableHealth of every station's table, sorted by station and table, and the
+# (path, error) of the files that could not be read
+def analyze(paths, workers=None):
+    if workers == 1 or len(paths) <= 1:
+        results = [_analyze(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_analyze, paths))
+    tables = {}
+    for _, health, error in results:
+        if health is not None:
+            tables.setdefault((health.station, health.table), []).append(health)
+    return ([table_health(files) for _, files in sorted(tables.items())],
+            [(path, error) for path, _, error in results if error is not None])
+
+
+# Text of a duration in seconds
+def _duration(seconds):
+    for unit, size in (("d", 86400), ("h", 3600), ("min", 60)):
+        if seconds >= size:
+            return "{0:.1f} {1}".format(seconds / size, unit)
+    return "{0:g} s".format(seconds)
+
+
+# A TableHealth as JSON, with its time stamps as text
+def _json(health):
+    report = health._asdict()
+    report.update(first=None if health.first is None else format_stamp(health.first),
+                  last=None if health.last is None else format_stamp(health.last),
+                  longest=[{"seconds": step, "after": format_stamp(start)} for step, start in health.longest])
+    return report
+
+
+# Prints the per-station report
+def print_report(tables, errors=(), out=sys.stdout):
+    out.write("{0:<16} {1:<14} {2:>10} {3:>9} {4:>6} {5:>9}  {6:<16}  {7}\n".format(
+        "Station", "Table", "Records", "Complete", "Gaps", "Missing", "From", "To"))
+    for health in tables:
+        if not health.records:
+            continue
+        out.write("{0:<16} {1:<14} {2:>10} {3:>9} {4:>6} {5:>9}  {6:<16}  {7}\n".format(
+            health.station, health.table, health.records,
+            "-" if health.completeness is None else "{0:.2%}".format(health.completeness),
+            "-" if health.gaps is None else health.gaps, "-" if health.missing is None else health.missing,
+            format_stamp(health.first), format_stamp(health.last)))
+        if health.longest:
+            out.write("      Longest gaps: {0}\n".format(", ".join(
+                "{0} after {1}".format(_duration(step), format_stamp(start)) for step, start in health.longest)))
+        if health.backwards:
+            out.write("      {0} records repeat or go back in time\n".format(health.backwards))
+        if health.skipped:
+            days = (health.last - health.first) / 86400
+            out.write("      Skipped scans: {0}\n".format(", ".join(
+                "{0} {1}{2}".format(scan, count, " ({0:.1f} per day)".format(count / days) if days else "")
+                for scan, count in health.skipped.items())))
+            if health.skip_rate is not None:
+                out.write("      Main scan skip rate: {0:.4%}\n".format(health.skip_rate))
+    for path, error in errors:
+        out.write("FAILED {0}: {1}\n".format(path, error))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the completeness, gaps and skipped scans of collected "
+                                                 "TOA5 data files.")
+    parser.add_argument("paths", nargs="+", help=".dat files or folders searched for them")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--json", default=None, help="save the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    tables, errors = analyze(find_files(args.paths), args.workers)
+    print_report(tables, errors)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"tables": [_json(health) for health in tables],
+                       "errors": [{"path": path, "error": error} for path, error in errors]}, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())